@@ -1,22 +1,32 @@
 import os
 import time
 import json
-import copy
 import logging
+import hashlib
 import functools
 import requests
 import threading
+from contextlib import contextmanager
+from leaguedirector.libs.fileWriter import FileWriter
+from leaguedirector.libs.playbackClock import PlaybackClock
 from leaguedirector.libs.requestGet import RequestGet
+from leaguedirector.libs.requestLane import RequestLane
+from leaguedirector.libs.requestPool import RequestPool
 from leaguedirector.libs.requestPost import RequestPost
 from leaguedirector.replayApiHostSingleton import ReplayApiHostSingleton
+from leaguedirector.sequence.constant import TIMING_TRACKS
+from leaguedirector.sequence.keyframeTrack import KeyframeTrack, createTrack
+from leaguedirector.sequence.rawKeyframeTrack import RawKeyframeTrack
+from leaguedirector.sequence.sequenceCache import SequenceCache
+from leaguedirector.sequence.sequenceHistory import SequenceHistory
+from leaguedirector.sequence.sequenceJournal import SequenceJournal
+from leaguedirector.sequence.sequenceLibrary import SequenceLibrary
 from leaguedirector.widgets import userpath
 from PySide2.QtCore import *
 from PySide2.QtNetwork import *
 from multiprocessing import Process
 import logging
 
-thread_pool = QThreadPool().globalInstance()
-
 
 class Resource(QObject):
     """
@@ -30,6 +40,10 @@ class Resource(QObject):
     readonly = False
     writeonly = False
     network = None
+    writeInterval = 30
+    coalesceWrites = True
+    pollInterval = 500
+    maxPollInterval = 4000
     _cert_verification_path = None
 
     @property
@@ -38,9 +52,22 @@ class Resource(QObject):
 
     def __init__(self):
         object.__setattr__(self, 'timestamp', time.time())
-        for name, default in self.fields.items():
+        for name, default in self.defaults():
             object.__setattr__(self, name, default)
         QObject.__init__(self)
+        self.pending = None
+        self.batching = 0
+        self.generation = 0
+        self.written = {}
+        self.reading = False
+        self.skippedPolls = 0
+        self.failures = 0
+        self.roundTrip = 0.0
+        self.writeTimer = QTimer()
+        self.writeTimer.timeout.connect(self.flush)
+        self.writeTimer.setSingleShot(True)
+        self.writes = RequestLane(RequestPool.get_instance())
+        self.writes.idle.connect(self.flush)
 
     def __setattr__(self, name, value):
         if name in self.fields:
@@ -48,10 +75,68 @@ class Resource(QObject):
                 raise AttributeError("Resource is readonly")
             if getattr(self, name) != value:
                 object.__setattr__(self, name, value)
-                self.update({name: value})
+                self.write({name: value})
         else:
             object.__setattr__(self, name, value)
 
+    def write(self, data):
+        """
+        Buffer field changes so they are sent together on the next flush.
+        """
+        if self.pending is None:
+            self.pending = {}
+        self.pending.update(data)
+        self.touch(data)
+        if not self.batching and not self.writeTimer.isActive():
+            self.writeTimer.start(self.writeInterval)
+
+    def flush(self):
+        """
+        Send the buffered write unless one is still in flight, in which case
+        it goes out as soon as the lane is idle again with whatever has been
+        merged into it by then.
+        """
+        self.writeTimer.stop()
+        if self.pending is not None and not self.writes.busy():
+            data = self.pending
+            self.pending = None
+            req = RequestPost(self.host + self.url, self.encode(data), self.getCertVerificationPath())
+            req.generation = self.generation
+            req.fields = list(data)
+            req.finished.connect(self.updateUI)
+            self.writes.start(req)
+
+    def encode(self, data):
+        return json.dumps(data, separators=(',', ':'))
+
+    def touch(self, data):
+        """
+        Record a local write so responses requested before it can't overwrite it.
+        """
+        self.generation += 1
+        for key in data:
+            self.written[key] = self.generation
+
+    def discardStale(self, data, generation):
+        """
+        Replace values in a response with the local ones for every field that
+        was written after the response was requested.
+        """
+        for key, written in self.written.items():
+            if written > generation and key in data:
+                data[key] = self.get(key)
+        return data
+
+    @contextmanager
+    def batch(self):
+        self.batching += 1
+        try:
+            yield self
+        finally:
+            self.batching -= 1
+            if not self.batching:
+                self.flush()
+
     def sslErrors(self, response, errors):
         allowed = [QSslError.CertificateUntrusted, QSslError.HostNameMismatch]
         response.ignoreSslErrors([e for e in errors if e.error() in allowed])
@@ -78,33 +163,71 @@ class Resource(QObject):
     def keys(self):
         return self.fields.keys()
 
+    def defaults(self):
+        return self.fields.items()
+
     def getCertVerificationPath(self):
         if Resource._cert_verification_path is None:
             os.environ['PATH'] = os.path.abspath('resources') + os.pathsep + os.environ['PATH']
-            Resource._cert_verification_path = os.path.abspath('resources/riotgames.pem')
+            # Lets the client trust a local mock server (see leaguedirector.mock)
+            Resource._cert_verification_path = os.environ.get('LEAGUEDIRECTOR_CERT') or \
+                os.path.abspath('resources/riotgames.pem')
         return Resource._cert_verification_path
 
     def update(self, data=None):
-        endpoint = self.host + self.url
         if data is None:
-            req = RequestGet(endpoint, self.getCertVerificationPath())
+            if self.reading:
+                # Don't stack polls on an endpoint that hasn't answered the last one
+                self.skippedPolls += 1
+                logging.debug('Skipped poll of %s (%d skipped)', self.url, self.skippedPolls)
+                return
+            self.reading = True
+            req = RequestGet(self.host + self.url, self.getCertVerificationPath())
+            req.generation = self.generation
+            req.finished.connect(self.updateUI)
+            RequestPool.get_instance().start(req)
+        elif self.coalesceWrites:
+            # Buffered field changes go along so they can't land after this write
+            self.pending = dict(self.pending or {}, **data)
+            self.touch(data)
+            self.flush()
         else:
-            req = RequestPost(endpoint, json.dumps(data), self.getCertVerificationPath())
-
-        req.finished.connect(self.updateUI)
-        thread_pool.start(req)
+            self.pending = data
+            self.touch(data)
+            self.flush()
 
     def updateUI(self, res):
+        if res.method == 'GET':
+            self.reading = False
+
+        if res.cancelled:
+            return
 
         if res.error is True or res.status_code != 200:
             Resource.connected = False
+            self.failures += 1
         else:
             Resource.connected = True
-            self.apply(json.loads(res.text))
-            self.timestamp = time.time()
+            self.failures = 0
+            self.timestamp = res.sampled
+            self.roundTrip = res.roundTrip
+            self.apply(self.discardStale(json.loads(res.text), res.generation))
+
+        if res.method == 'POST':
+            # Anything requested before this write completed may still hold the old values
+            self.touch(res.fields)
 
         self.updated.emit()
 
+    def pollDelay(self):
+        """
+        Milliseconds until this resource should be polled again, backing off
+        exponentially while the endpoint isn't answering.
+        """
+        if self.failures:
+            return min(self.pollInterval * 2 ** min(self.failures, 16), self.maxPollInterval)
+        return self.pollInterval
+
     def apply(self, data):
         if not self.writeonly:
             for key, value in data.items():
@@ -116,6 +239,7 @@ class Game(Resource):
     url = '/replay/game'
     fields = {'processID': 0}
     readonly = True
+    pollInterval = 2000
 
 
 class Recording(Resource):
@@ -133,6 +257,13 @@ class Recording(Resource):
         'enforceFrameRate': False,
         'replaySpeed': 0,
     }
+    pollInterval = 2000
+    recordingPollInterval = 250
+
+    def pollDelay(self):
+        if self.recording and not self.failures:
+            return self.recordingPollInterval
+        return Resource.pollDelay(self)
 
 
 class Render(Resource):
@@ -247,10 +378,14 @@ class Particles(Resource):
     url = '/replay/particles'
     fields = {}
     particles = {}
+    pollInterval = 2000
 
     def apply(self, data):
         self.particles = data
 
+    def get(self, name):
+        return self.getParticle(name)
+
     def items(self):
         return self.particles.items()
 
@@ -259,6 +394,7 @@ class Particles(Resource):
 
     def setParticle(self, particle, enabled):
         if particle in self.particles:
+            self.particles[particle] = enabled
             self.update({particle: enabled})
 
     def getParticle(self, particle):
@@ -274,13 +410,48 @@ class Playback(Resource):
         'speed': 0.0,
         'length': 1.0,
     }
+    pollInterval = 1000
+    clockFields = ('paused', 'time', 'speed')
+
+    def __init__(self):
+        Resource.__init__(self)
+        self.clock = PlaybackClock()
+        self.stale = False
 
     @property
     def currentTime(self):
-        if self.paused:
-            return self.time
-        else:
-            return min(self.time + (time.time() - self.timestamp) * self.speed, self.length)
+        return self.clock.time()
+
+    def write(self, data):
+        Resource.write(self, data)
+        self.resetClock(data)
+
+    def update(self, data=None):
+        Resource.update(self, data)
+        if data is not None:
+            self.resetClock(data)
+
+    def resetClock(self, data):
+        """
+        Restart the prediction from a local change instead of waiting for the next poll.
+        """
+        if any(key in data for key in self.clockFields):
+            self.clock.reset(
+                data.get('time', self.clock.time()),
+                time.time(),
+                data.get('speed', self.speed),
+                not data.get('paused', self.paused),
+            )
+
+    def discardStale(self, data, generation):
+        self.stale = any(self.written.get(key, 0) > generation for key in self.clockFields)
+        return Resource.discardStale(self, data, generation)
+
+    def apply(self, data):
+        Resource.apply(self, data)
+        if not self.stale:
+            running = not self.paused and not self.seeking
+            self.clock.sample(self.time, self.speed, running, self.length, self.timestamp, self.roundTrip)
 
     @property
     def currentTimeFormatted(self):
@@ -314,39 +485,44 @@ class Playback(Resource):
 class Sequence(Resource):
     dataLoaded = Signal()
     namesLoaded = Signal()
+    editFinished = Signal()
+    # Track name to the keys of keyframes that changed, None for the whole track
+    keyframesChanged = Signal(object)
     url = '/replay/sequence'
     writeonly = True
-    history = []
-    history_index = 0
-    fields = {
-        'playbackSpeed': [],
-        'cameraPosition': [],
-        'cameraRotation': [],
-        'fieldOfView': [],
-        'nearClip': [],
-        'farClip': [],
-        'navGridOffset': [],
-        'skyboxRotation': [],
-        'skyboxRadius': [],
-        'skyboxOffset': [],
-        'sunDirection': [],
-        'depthFogEnabled': [],
-        'depthFogStart': [],
-        'depthFogEnd': [],
-        'depthFogIntensity': [],
-        'depthFogColor': [],
-        'heightFogEnabled': [],
-        'heightFogStart': [],
-        'heightFogEnd': [],
-        'heightFogIntensity': [],
-        'heightFogColor': [],
-        'depthOfFieldEnabled': [],
-        'depthOfFieldCircle': [],
-        'depthOfFieldWidth': [],
-        'depthOfFieldNear': [],
-        'depthOfFieldMid': [],
-        'depthOfFieldFar': [],
-    }
+    coalesceWrites = False
+    previewInterval = 100
+    compactInterval = 30000
+    # Track names, every Sequence creates its own tracks in defaults
+    fields = (
+        'playbackSpeed',
+        'cameraPosition',
+        'cameraRotation',
+        'fieldOfView',
+        'nearClip',
+        'farClip',
+        'navGridOffset',
+        'skyboxRotation',
+        'skyboxRadius',
+        'skyboxOffset',
+        'sunDirection',
+        'depthFogEnabled',
+        'depthFogStart',
+        'depthFogEnd',
+        'depthFogIntensity',
+        'depthFogColor',
+        'heightFogEnabled',
+        'heightFogStart',
+        'heightFogEnd',
+        'heightFogIntensity',
+        'heightFogColor',
+        'depthOfFieldEnabled',
+        'depthOfFieldCircle',
+        'depthOfFieldWidth',
+        'depthOfFieldNear',
+        'depthOfFieldMid',
+        'depthOfFieldFar',
+    )
     blendOptions = [
         'linear',
         'snap',
@@ -392,6 +568,15 @@ class Sequence(Resource):
         self.names = []
         self.directory = None
         self.sequencing = False
+        self.editing = 0
+        self.edited = False
+        self.remoteDigest = None
+        self.remotePayload = None
+        self.history = SequenceHistory()
+        self.journal = SequenceJournal()
+        self.cache = SequenceCache()
+        self.library = SequenceLibrary()
+        self.library.changed.connect(self.libraryChanged)
         self.saveRemoteTimer = QTimer()
         self.saveRemoteTimer.timeout.connect(self.saveRemoteNow)
         self.saveRemoteTimer.setSingleShot(True)
@@ -401,41 +586,129 @@ class Sequence(Resource):
         self.saveFileTimer = QTimer()
         self.saveFileTimer.timeout.connect(self.saveFileNow)
         self.saveFileTimer.setSingleShot(True)
+        self.previewTimer = QTimer()
+        self.previewTimer.timeout.connect(self.saveRemoteNow)
+        self.previewTimer.setSingleShot(True)
+
+    def defaults(self):
+        return [(name, KeyframeTrack()) for name in self.fields]
+
+    def keys(self):
+        return self.fields
 
     def update(self, *args):
+        if self.editing:
+            # Only preview in game while an edit is open, everything is saved once it ends
+            self.edited = True
+            if self.previewInterval and not self.previewTimer.isActive():
+                self.previewTimer.start(self.previewInterval)
+            return
         self.saveRemote()
-        self.saveFile()
+        self.compact()
         self.saveHistory()
 
+    def beginEdit(self):
+        self.editing += 1
+        self.journal.begin()
+
+    def endEdit(self):
+        self.editing = max(self.editing - 1, 0)
+        self.journal.commit()
+        if not self.editing and self.edited:
+            self.edited = False
+            self.previewTimer.stop()
+            self.update()
+        if not self.editing:
+            self.editFinished.emit()
+
+    @contextmanager
+    def edit(self):
+        """
+        Group changes to many keyframes into one remote save and one undo step.
+        """
+        self.beginEdit()
+        try:
+            yield self
+        finally:
+            self.endEdit()
+
     def data(self):
+        return {key: getattr(self, key).list() for key in self.fields}
+
+    def tracks(self):
         return {key: getattr(self, key) for key in self.fields}
 
     @property
     def startTime(self):
-        keyframes = self.cameraPosition + self.cameraRotation
-        if len(keyframes):
-            return min(keyframe['time'] for keyframe in keyframes)
+        times = [getattr(self, name).startTime for name in TIMING_TRACKS if len(getattr(self, name))]
+        if len(times):
+            return min(times)
 
     @property
     def endTime(self):
-        keyframes = self.cameraPosition + self.cameraRotation
-        if len(keyframes):
-            return max(keyframe['time'] for keyframe in keyframes)
+        times = [getattr(self, name).endTime for name in TIMING_TRACKS if len(getattr(self, name))]
+        if len(times):
+            return max(times)
 
     def path(self):
         return os.path.join(self.directory, self.name + '.json')
 
     def load(self, name):
-        self.saveFileNow()
-        self.loadFile(name)
+        self.stash()
+        if not self.restore(name):
+            self.loadFile(name)
 
     def create(self, name):
-        self.saveFileNow()
+        self.stash()
         self.clearData()
         self.resetHistory()
         self.saveFileNow(name)
+        self.cache.discard(self.path())
         self.reloadNames()
 
+    def stash(self):
+        """
+        Save the open sequence if it has changed and keep it in the cache
+        together with its undo history, leaving empty tracks in its place.
+        """
+        self.flushHistory()
+        if not self.name:
+            return
+        if self.journal.entries or self.journal.path is None or self.saveFileTimer.isActive():
+            self.saveFileNow()
+        self.saveFileTimer.stop()
+        self.cache.put(self.path(), {
+            'tracks': {name: getattr(self, name) for name in self.fields},
+            'history': self.history,
+            'journal': self.journal,
+        })
+        self.history = SequenceHistory()
+        self.journal = SequenceJournal()
+        for name in self.fields:
+            object.__setattr__(self, name, KeyframeTrack())
+
+    def restore(self, name):
+        """
+        Open a sequence from the cache, as long as its file still holds what
+        was last saved from it. Returns False if it has to be loaded instead.
+        """
+        self.name = name
+        state = self.cache.take(self.path())
+        if state is None or not os.path.exists(self.path()):
+            return False
+        FileWriter.get_instance().flush(self.path())
+        with open(self.path(), 'r', encoding='utf8') as f:
+            if state['journal'].digest(f.read()) != state['journal'].snapshot:
+                # Changed outside of the editor since it was cached
+                return False
+        self.history = state['history']
+        self.journal = state['journal']
+        for key, track in state['tracks'].items():
+            object.__setattr__(self, key, track)
+        self.dataLoaded.emit()
+        self.saveRemote()
+        return True
+
     def save(self, name=None):
         self.saveFile(name)
 
@@ -446,71 +719,128 @@ class Sequence(Resource):
         self.reloadNames()
 
     def undo(self):
-        self.loadHistory(self.history_index - 1)
+        self.flushHistory()
+        self.loadHistory(self.history.index - 1)
 
     def redo(self):
-        self.loadHistory(self.history_index + 1)
+        self.flushHistory()
+        self.loadHistory(self.history.index + 1)
 
     def setDirectory(self, path):
         if path and os.path.exists(path) and os.path.isdir(path):
+            self.stash()
             self.directory = path
+            self.name = ''
+            self.library.setDirectory(path)
             self.clearData()
             self.loadFile('default')
             self.saveFileNow()
-            self.reloadNames()
 
     def saveRemoteNow(self):
-        self.sortData()
-        if self.sequencing:
-            Resource.update(self, self.data())
-        else:
-            Resource.update(self, {})
+        data = self.data() if self.sequencing else {}
+        text = Resource.encode(self, data)
+        digest = hashlib.sha1(text.encode()).hexdigest()
+        if digest == self.remoteDigest:
+            return
+        self.remoteDigest = digest
+        self.remotePayload = (data, text)
+        logging.debug('Sending sequence (%d bytes)', len(text))
+        Resource.update(self, data)
+
+    def resendRemote(self):
+        self.remoteDigest = None
+        self.saveRemote()
+
+    def encode(self, data):
+        # Reuse the text that was hashed instead of encoding the sequence twice
+        if self.remotePayload is not None and self.remotePayload[0] is data:
+            text = self.remotePayload[1]
+            self.remotePayload = None
+            return text
+        return Resource.encode(self, data)
+
+    def updateUI(self, res):
+        if res.method == 'POST' and (res.error is True or res.status_code != 200):
+            # The game may not have the last payload, don't skip sending it again
+            self.remoteDigest = None
+        Resource.updateUI(self, res)
 
     def saveRemote(self):
         self.saveRemoteTimer.start(0)
 
     def saveHistoryNow(self):
-        self.history = self.history[0:self.history_index + 1]
-        self.history_index = len(self.history)
-        self.history.append(copy.deepcopy(self.data()))
+        self.history.push(self.tracks())
 
     def saveHistory(self):
         self.saveHistoryTimer.start(500)
 
+    def flushHistory(self):
+        # Record an edit that is still waiting on the timer so undo can't skip past it
+        if self.saveHistoryTimer.isActive():
+            self.saveHistoryTimer.stop()
+            self.saveHistoryNow()
+
     def loadHistory(self, index):
-        if len(self.history):
-            self.history_index = max(min(index, len(self.history) - 1), 0)
-            self.loadData(copy.deepcopy(self.history[self.history_index]))
+        changes = self.history.move(index)
+        if changes:
+            changed = {}
+            for name, keyframes in changes.items():
+                if None in keyframes:
+                    # Tracks without keyframe keys are recorded whole
+                    object.__setattr__(self, name, RawKeyframeTrack(keyframes[None][1] or []))
+                    changed[name] = None
+                else:
+                    getattr(self, name).patch(keyframes)
+                    changed[name] = list(keyframes)
+            self.history.sync(self.tracks())
+            self.keyframesChanged.emit(changed)
             self.saveRemote()
             self.saveFileNow()
 
     def resetHistory(self):
-        self.history = []
-        self.history_index = 0
+        self.history.clear()
 
     def loadFile(self, name):
         self.name = name
+        writer = FileWriter.get_instance()
+        writer.flush(self.path())
+        writer.flush(SequenceJournal.pathFor(self.path()))
         if os.path.exists(self.path()):
-            with open(self.path(), 'r') as f:
-                self.resetHistory()
-                self.loadData(json.load(f))
-                self.saveRemote()
-                self.saveHistory()
+            with open(self.path(), 'r', encoding='utf8') as f:
+                data, replayed = self.journal.load(self.path(), f.read())
+            self.resetHistory()
+            self.loadData(data)
+            self.saveRemote()
+            self.saveHistory()
+            if replayed:
+                logging.info('Recovered %d edits of sequence %s from its journal', replayed, self.name)
+                self.saveFileNow()
+        else:
+            self.journal.path = None
 
     def saveFileNow(self, name=None):
         self.name = name or self.name
         if self.name:
-            path = self.path()
-            exists = os.path.exists(path)
-            with open(path, 'w') as f:
-                json.dump(self.data(), f, sort_keys=True, indent=4)
-                if not exists:
-                    self.reloadNames()
+            # data() builds new dicts, the writer thread never sees keyframes mid edit
+            self.journal.compact(self.path(), self.data())
+            if self.name not in self.names:
+                self.names = sorted(self.names + [self.name], key=str.lower)
+                self.namesLoaded.emit()
 
     def saveFile(self, name=None):
         self.name = name or self.name
         self.saveFileTimer.start(1000)
 
+    def compact(self):
+        """
+        Edits are already in the journal, fold it into the sequence file
+        every compactInterval or sooner once it grows long.
+        """
+        if self.journal.path is None or self.journal.entries >= self.journal.maxEntries:
+            self.saveFile()
+        elif self.journal.entries and not self.saveFileTimer.isActive():
+            self.saveFileTimer.start(self.compactInterval)
+
     def clearData(self):
         for track in self.fields:
             getattr(self, track, []).clear()
@@ -520,25 +850,21 @@ class Sequence(Resource):
         if isinstance(data, dict):
             for key, value in data.items():
                 if value is not None:
-                    object.__setattr__(self, key, value)
+                    object.__setattr__(self, key, createTrack(value) if key in self.fields else value)
             self.dataLoaded.emit()
 
-    def sortData(self):
-        for track in self.fields:
-            if getattr(self, track):
-                getattr(self, track).sort(key=lambda item: item['time'])
-
     def reloadNames(self):
-        self.names = sorted([f.replace('.json', '') for f in os.listdir(self.directory) if f.endswith('.json')],
-                            key=str.lower)
-        self.namesLoaded.emit()
+        self.library.refresh()
 
-    @property
-    def index(self):
-        try:
-            return self.names.index(self.name)
-        except ValueError:
-            return 0
+    def libraryChanged(self):
+        names = set(self.library.names())
+        if self.name:
+            # Still queued for writing when it was just created
+            names.add(self.name)
+        names = sorted(names, key=str.lower)
+        if names != self.names:
+            self.names = names
+            self.namesLoaded.emit()
 
     def setSequencing(self, value):
         self.sequencing = value
@@ -553,17 +879,34 @@ class Sequence(Resource):
             'value': self.getValue(name),
             'blend': 'linear',
         }
-        self.appendKeyframe(name, keyframe)
-        return keyframe
+        return self.appendKeyframe(name, keyframe)
 
     def appendKeyframe(self, name, keyframe):
-        getattr(self, name).append(keyframe)
+        """
+        Add a keyframe to a track and return the keyframe as stored by the track.
+        """
+        keyframe = getattr(self, name).append(keyframe)
+        self.journal.add(name, keyframe)
         self.update()
+        return keyframe
 
     def removeKeyframe(self, name, item):
+        self.journal.remove(name, item)
         getattr(self, name).remove(item)
         self.update()
 
+    def retimeKeyframe(self, name, item, time):
+        old = dict(item)
+        getattr(self, name).retime(item, time)
+        self.journal.modify(name, old, item)
+        self.update()
+
+    def modifyKeyframe(self, name, item, key, value):
+        old = dict(item)
+        getattr(self, name).setField(item, key, value)
+        self.journal.modify(name, old, item)
+        self.update()
+
     def getLabel(self, name):
         if name == 'cameraPosition':
             return 'Camera Position'
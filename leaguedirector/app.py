@@ -11,6 +11,12 @@ from leaguedirector.bindings.keybindingsWindow import KeybindingsWindow
 from leaguedirector.replayApiHostSingleton import ReplayApiHostSingleton
 from leaguedirector.enable import *
 from leaguedirector.api import Game, Playback, Render, Particles, Recording, Sequence
+from leaguedirector.libs.fileWriter import FileWriter
+from leaguedirector.libs.glyphCache import GlyphCache
+from leaguedirector.libs.pollScheduler import PollScheduler
+from leaguedirector.libs.request import Request
+from leaguedirector.libs.requestMetrics import RequestMetrics
+from leaguedirector.metrics.metricsWindow import MetricsWindow
 from leaguedirector.settings import Settings
 from leaguedirector.visible.visibleWindow import VisibleWindow
 from leaguedirector.widget.floatInput import FloatInput
@@ -387,24 +393,24 @@ class Api(QObject):
         self.playback = Playback()
         self.recording = Recording()
         self.sequence = Sequence(self.render, self.playback)
+        self.scheduler = PollScheduler(self)
+        self.scheduler.add(self.game)
+        self.scheduler.add(self.render)
+        self.scheduler.add(self.particles)
+        self.scheduler.add(self.playback)
+        self.scheduler.add(self.recording)
         self.game.updated.connect(self.updated)
         self.render.updated.connect(self.updated)
         self.particles.updated.connect(self.updated)
         self.playback.updated.connect(self.updated)
         self.recording.updated.connect(self.updated)
+        self.connected.connect(self.sequence.resendRemote)
 
     def updated(self):
         if not self.wasConnected and self.game.connected:
             self.connected.emit()
         self.wasConnected = self.game.connected
 
-    def update(self):
-        self.game.update()
-        self.render.update()
-        self.particles.update()
-        self.playback.update()
-        self.recording.update()
-
     def onKeybinding(self, name):
         if name == 'camera_up':
             self.render.moveCamera(z=7)
@@ -591,11 +597,13 @@ class LeagueDirector(object):
 
     def setup(self):
         self.loadTheme()
+        GlyphCache.get_instance().load('kfnormal.png', 'kfoverlap.png', 'plus.png')
         self.window = QMainWindow()
         self.mdi = QMdiArea()
         self.api = Api()
         self.windows = {}
         self.settings = Settings()
+        self.setupRequestTimeouts()
         self.bindings = self.setupBindings()
         self.addWindow(RenderWindow(self.api), 'render')
         self.addWindow(ParticlesWindow(self.api), 'particles')
@@ -603,6 +611,7 @@ class LeagueDirector(object):
         self.addWindow(TimelineWindow(self.api), 'timeline')
         self.addWindow(RecordingWindow(self.api), 'recording')
         self.addWindow(KeybindingsWindow(self.bindings), 'bindings')
+        self.addWindow(MetricsWindow(self.api), 'metrics')
         self.addWindow(ConnectWindow(self.api), 'connect')
         self.addWindow(UpdateWindow(), 'update')
         self.window.setCentralWidget(self.mdi)
@@ -615,12 +624,16 @@ class LeagueDirector(object):
         self.bindings.triggered.connect(self.api.onKeybinding)
         self.bindings.triggered.connect(self.windows['timeline'].onKeybinding)
         self.bindings.triggered.connect(self.windows['visible'].onKeybinding)
+        self.api.scheduler.setCondition(self.api.particles, self.windows['particles'].isVisible)
+        self.api.scheduler.start()
         self.timerUpdate = schedule(500, self.update)
         self.timerSave = schedule(5000, self.saveSettings)
+        self.timerMetrics = self.setupMetricsLogging()
         self.update()
 
     def closeEvent(self, event):
         self.saveSettings()
+        FileWriter.get_instance().flush()
         QMainWindow.closeEvent(self.window, event)
 
     def setupLogging(self):
@@ -641,6 +654,18 @@ class LeagueDirector(object):
         logging.info('Started League Director (%s)', leaguedirector.__version__)
         qInstallMessageHandler(self.handleMessage)
 
+    def setupRequestTimeouts(self):
+        Request.setTimeouts(
+            self.settings.value('requests/connectTimeout', Request.connectTimeout),
+            self.settings.value('requests/readTimeout', Request.readTimeout),
+        )
+
+    def setupMetricsLogging(self):
+        # A debugging aid, off unless metrics/interval is set to a number of seconds
+        interval = self.settings.value('metrics/interval', 0)
+        if interval:
+            return schedule(int(interval * 1000), RequestMetrics.get_instance().log)
+
     def checkUpdate(self):
         self.updateAvailable = False
         request = QNetworkRequest(QUrl('https://api.github.com/repos/riotgames/leaguedirector/releases/latest'))
@@ -779,7 +804,6 @@ class LeagueDirector(object):
         widget.update()
 
     def update(self):
-        self.api.update()
         self.bindings.setGamePid([self.app.applicationPid(), self.api.game.processID])
         for name, window in self.windows.items():
             if name == 'update':
@@ -808,15 +832,16 @@ class LeagueDirector(object):
                 widget.restoreSettings(self.settings.value('{}/settings'.format(name), {}) or {})
 
     def saveSettings(self):
-        self.settings.setValue('bindings', self.bindings.getBindings())
-        self.settings.setValue('window/state', int(self.window.windowState()))
-        self.settings.setValue('window/geo', self.window.geometry().getRect())
-        for name, widget in self.windows.items():
-            parent = widget.parentWidget()
-            self.settings.setValue('{}/state'.format(name), int(parent.windowState()))
-            self.settings.setValue('{}/geo'.format(name), parent.geometry().getRect())
-            if hasattr(widget, 'saveSettings'):
-                self.settings.setValue('{}/settings'.format(name), widget.saveSettings())
+        with self.settings.batch():
+            self.settings.setValue('bindings', self.bindings.getBindings())
+            self.settings.setValue('window/state', int(self.window.windowState()))
+            self.settings.setValue('window/geo', self.window.geometry().getRect())
+            for name, widget in self.windows.items():
+                parent = widget.parentWidget()
+                self.settings.setValue('{}/state'.format(name), int(parent.windowState()))
+                self.settings.setValue('{}/geo'.format(name), parent.geometry().getRect())
+                if hasattr(widget, 'saveSettings'):
+                    self.settings.setValue('{}/settings'.format(name), widget.saveSettings())
 
     def loadTheme(self):
         palette = QPalette()
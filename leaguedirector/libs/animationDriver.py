@@ -0,0 +1,47 @@
+import threading
+
+from PySide2.QtCore import QObject, QTimer, Signal, Qt
+from PySide2.QtGui import QGuiApplication
+
+
+class AnimationDriver(QObject):
+    """
+    One timer at the screen refresh rate for everything that animates with
+    playback, running only while an owner is active.
+    """
+    tick = Signal()
+    _instance = None
+    _lock = threading.Lock()
+    defaultRefreshRate = 60.0
+
+    def __init__(self):
+        QObject.__init__(self)
+        self.owners = set()
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.tick.emit)
+
+    @classmethod
+    def get_instance(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = AnimationDriver()
+            return cls._instance
+
+    def interval(self):
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return max(1, int(1000 / (rate if rate > 0 else self.defaultRefreshRate)))
+
+    def setActive(self, owner, active):
+        if active:
+            self.owners.add(owner)
+        else:
+            self.owners.discard(owner)
+        if self.owners and not self.timer.isActive():
+            self.timer.start(self.interval())
+        elif not self.owners and self.timer.isActive():
+            self.timer.stop()
+
+    def isActive(self):
+        return self.timer.isActive()
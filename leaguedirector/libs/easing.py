@@ -0,0 +1,165 @@
+"""
+Vectorized versions of the easing curves the Replay API uses to blend
+between sequence keyframes. Every function maps an array of progress
+values in [0, 1] to eased values, keyed by the names in Sequence.blendOptions.
+"""
+import numpy as np
+
+
+def inOut(easeIn, easeOut):
+    def easeInOut(p):
+        result = np.empty_like(p)
+        first = p < 0.5
+        result[first] = 0.5 * easeIn(p[first] * 2)
+        result[~first] = 0.5 * easeOut(p[~first] * 2 - 1) + 0.5
+        return result
+    return easeInOut
+
+
+def linear(p):
+    return p
+
+
+def snap(p):
+    return np.where(p < 1, 0.0, 1.0)
+
+
+def smoothStep(p):
+    return p * p * (3 - 2 * p)
+
+
+def smootherStep(p):
+    return p * p * p * (p * (p * 6 - 15) + 10)
+
+
+def quadraticEaseIn(p):
+    return p * p
+
+
+def quadraticEaseOut(p):
+    return -(p * (p - 2))
+
+
+def cubicEaseIn(p):
+    return p ** 3
+
+
+def cubicEaseOut(p):
+    return (p - 1) ** 3 + 1
+
+
+def quarticEaseIn(p):
+    return p ** 4
+
+
+def quarticEaseOut(p):
+    return 1 - (p - 1) ** 4
+
+
+def quinticEaseIn(p):
+    return p ** 5
+
+
+def quinticEaseOut(p):
+    return (p - 1) ** 5 + 1
+
+
+def sineEaseIn(p):
+    return np.sin((p - 1) * np.pi / 2) + 1
+
+
+def sineEaseOut(p):
+    return np.sin(p * np.pi / 2)
+
+
+def circularEaseIn(p):
+    return 1 - np.sqrt(1 - p * p)
+
+
+def circularEaseOut(p):
+    return np.sqrt((2 - p) * p)
+
+
+def exponentialEaseIn(p):
+    return np.where(p <= 0, 0.0, 2 ** (10 * (p - 1)))
+
+
+def exponentialEaseOut(p):
+    return np.where(p >= 1, 1.0, 1 - 2 ** (-10 * p))
+
+
+def elasticEaseIn(p):
+    return np.sin(13 * np.pi / 2 * p) * 2 ** (10 * (p - 1))
+
+
+def elasticEaseOut(p):
+    return np.sin(-13 * np.pi / 2 * (p + 1)) * 2 ** (-10 * p) + 1
+
+
+def backEaseIn(p):
+    return p ** 3 - p * np.sin(p * np.pi)
+
+
+def backEaseOut(p):
+    return 1 - backEaseIn(1 - p)
+
+
+def bounceEaseOut(p):
+    return np.select(
+        [p < 4 / 11.0, p < 8 / 11.0, p < 9 / 10.0],
+        [
+            121 * p * p / 16.0,
+            363 / 40.0 * p * p - 99 / 10.0 * p + 17 / 5.0,
+            4356 / 361.0 * p * p - 35442 / 1805.0 * p + 16061 / 1805.0,
+        ],
+        54 / 5.0 * p * p - 513 / 25.0 * p + 268 / 25.0,
+    )
+
+
+def bounceEaseIn(p):
+    return 1 - bounceEaseOut(1 - p)
+
+
+EASINGS = {
+    'linear': linear,
+    'snap': snap,
+    'smoothStep': smoothStep,
+    'smootherStep': smootherStep,
+    'quadraticEaseIn': quadraticEaseIn,
+    'quadraticEaseOut': quadraticEaseOut,
+    'quadraticEaseInOut': inOut(quadraticEaseIn, quadraticEaseOut),
+    'cubicEaseIn': cubicEaseIn,
+    'cubicEaseOut': cubicEaseOut,
+    'cubicEaseInOut': inOut(cubicEaseIn, cubicEaseOut),
+    'quarticEaseIn': quarticEaseIn,
+    'quarticEaseOut': quarticEaseOut,
+    'quarticEaseInOut': inOut(quarticEaseIn, quarticEaseOut),
+    'quinticEaseIn': quinticEaseIn,
+    'quinticEaseOut': quinticEaseOut,
+    'quinticEaseInOut': inOut(quinticEaseIn, quinticEaseOut),
+    'sineEaseIn': sineEaseIn,
+    'sineEaseOut': sineEaseOut,
+    'sineEaseInOut': inOut(sineEaseIn, sineEaseOut),
+    'circularEaseIn': circularEaseIn,
+    'circularEaseOut': circularEaseOut,
+    'circularEaseInOut': inOut(circularEaseIn, circularEaseOut),
+    'exponentialEaseIn': exponentialEaseIn,
+    'exponentialEaseOut': exponentialEaseOut,
+    'exponentialEaseInOut': inOut(exponentialEaseIn, exponentialEaseOut),
+    'elasticEaseIn': elasticEaseIn,
+    'elasticEaseOut': elasticEaseOut,
+    'elasticEaseInOut': inOut(elasticEaseIn, elasticEaseOut),
+    'backEaseIn': backEaseIn,
+    'backEaseOut': backEaseOut,
+    'backEaseInOut': inOut(backEaseIn, backEaseOut),
+    'bounceEaseIn': bounceEaseIn,
+    'bounceEaseOut': bounceEaseOut,
+    'bounceEaseInOut': inOut(bounceEaseIn, bounceEaseOut),
+}
+
+
+def ease(blend, p):
+    """
+    Ease an array of progress values, unknown blend names fall back to linear.
+    """
+    return EASINGS.get(blend, linear)(np.asarray(p, dtype=float))
@@ -0,0 +1,110 @@
+import os
+import logging
+import tempfile
+import threading
+
+
+class FileWriter(object):
+    """
+    Writes files in order on a background thread, only the latest queued
+    content of a path is written.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.jobs = []
+        self.writes = {}
+        self.active = None
+        self.thread = threading.Thread(target=self.run, name='FileWriter', daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def get_instance(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = FileWriter()
+            return cls._instance
+
+    def write(self, path, serialize, writer=None):
+        """
+        Replace the file at path with the text returned by serialize, which is
+        called on the writer thread and must not touch state the UI changes.
+        A custom writer(path, text) can take over storing the text.
+        """
+        with self.condition:
+            job = self.writes.pop(path, None)
+            if job is not None:
+                self.jobs = [other for other in self.jobs if other is not job]
+            job = [path, serialize, writer or self.replace]
+            self.writes[path] = job
+            self.jobs.append(job)
+            self.condition.notify_all()
+
+    def append(self, path, text):
+        self.call(path, lambda: self.appendNow(path, text))
+
+    def call(self, path, function):
+        """
+        Run any function on the writer thread in order with the writes to path.
+        """
+        with self.condition:
+            self.jobs.append([path, function, None])
+            self.condition.notify_all()
+
+    def pending(self, path=None):
+        # The condition's lock is reentrant, flush calls this while holding it
+        with self.condition:
+            if path is None:
+                return bool(self.jobs) or self.active is not None
+            return self.active == path or any(job[0] == path for job in self.jobs)
+
+    def flush(self, path=None):
+        """
+        Wait until everything queued for path, or for every path, is on disk.
+        """
+        with self.condition:
+            while self.pending(path):
+                self.condition.wait()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.jobs:
+                    self.condition.wait()
+                path, function, writer = self.jobs.pop(0)
+                if writer is not None:
+                    del self.writes[path]
+                self.active = path
+            try:
+                if writer is not None:
+                    writer(path, function())
+                else:
+                    function()
+            except Exception:
+                logging.exception('Failed to write %s', path)
+            finally:
+                with self.condition:
+                    self.active = None
+                    self.condition.notify_all()
+
+    def replace(self, path, text):
+        directory = os.path.dirname(path) or '.'
+        fd, temp = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, path)
+        except Exception:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+
+    def appendNow(self, path, text):
+        with open(path, 'a', encoding='utf8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
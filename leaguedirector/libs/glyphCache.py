@@ -0,0 +1,63 @@
+import threading
+
+from PySide2.QtCore import Qt
+from PySide2.QtGui import QPixmap, QPainter, QColor
+
+from leaguedirector.widgets import respath
+
+
+class GlyphCache(object):
+    """
+    Decodes each keyframe and header image once and shares it, along with its
+    tinted variants. Gui thread only.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.pixmaps = {}
+        self.tinted = {}
+
+    @classmethod
+    def get_instance(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = GlyphCache()
+            return cls._instance
+
+    def load(self, *names):
+        for name in names:
+            self.pixmap(name)
+
+    def pixmap(self, name):
+        pixmap = self.pixmaps.get(name)
+        if pixmap is None:
+            pixmap = self.pixmaps[name] = QPixmap(respath(name))
+        return pixmap
+
+    def glyph(self, name, color=None):
+        """
+        Pixmap of a resource, multiplied by color when one is given.
+        """
+        if color is None:
+            return self.pixmap(name)
+        color = QColor(color)
+        key = (name, color.rgba())
+        pixmap = self.tinted.get(key)
+        if pixmap is None:
+            pixmap = self.tinted[key] = self.tint(self.pixmap(name), color)
+        return pixmap
+
+    @staticmethod
+    def tint(source, color):
+        pixmap = QPixmap(source.size())
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.drawPixmap(0, 0, source)
+        painter.setCompositionMode(QPainter.CompositionMode_Multiply)
+        painter.fillRect(pixmap.rect(), color)
+        # Multiplying also fills the transparent pixels, cut them out again
+        painter.setCompositionMode(QPainter.CompositionMode_DestinationIn)
+        painter.drawPixmap(0, 0, source)
+        painter.end()
+        return pixmap
@@ -0,0 +1,81 @@
+import time
+
+
+class PlaybackClock(object):
+    """
+    Predicts the game's replay time between polls, easing prediction errors in
+    so the timeline cursor doesn't jump.
+    """
+    snapThreshold = 0.25
+    smoothing = 0.3
+    driftWindow = 2.0
+    maxDrift = 0.2
+
+    def __init__(self):
+        self.length = 0.0
+        self.speed = 0.0
+        self.drift = 1.0
+        self.running = False
+        self.base = 0.0
+        self.reference = time.time()
+        self.anchorGame = 0.0
+        self.anchorLocal = self.reference
+        self.correction = 0.0
+        self.correctionStart = self.reference
+        self.roundTrip = None
+
+    def rate(self):
+        return self.speed * self.drift if self.running else 0.0
+
+    def target(self, now):
+        return self.base + (now - self.reference) * self.rate()
+
+    def remaining(self, now):
+        if not self.correction:
+            return 0.0
+        progress = (now - self.correctionStart) / self.smoothing
+        if progress >= 1:
+            self.correction = 0.0
+            return 0.0
+        return self.correction * (1 - progress)
+
+    def time(self, now=None):
+        now = time.time() if now is None else now
+        value = self.target(now) - self.remaining(now)
+        return max(0.0, min(value, self.length)) if self.length else max(0.0, value)
+
+    def reset(self, gameTime, sampled, speed, running, length=None):
+        """
+        Forget the current model and start again from a known game time.
+        """
+        self.length = self.length if length is None else length
+        self.speed = speed
+        self.running = running
+        self.base = gameTime
+        self.reference = sampled
+        self.anchorGame = gameTime
+        self.anchorLocal = sampled
+        self.correction = 0.0
+
+    def sample(self, gameTime, speed, running, length, sampled, roundTrip):
+        """
+        Fold in a game time reported by a poll sampled at local time 'sampled'.
+        """
+        self.roundTrip = roundTrip if self.roundTrip is None else self.roundTrip + (roundTrip - self.roundTrip) * 0.2
+        self.length = length
+        if not running or not self.running or speed != self.speed:
+            self.reset(gameTime, sampled, speed, running)
+            return
+        if abs(gameTime - self.target(sampled)) > self.snapThreshold:
+            self.reset(gameTime, sampled, speed, running)
+            return
+        elapsed = sampled - self.anchorLocal
+        if elapsed >= self.driftWindow and speed:
+            drift = (gameTime - self.anchorGame) / elapsed / speed
+            self.drift = max(1 - self.maxDrift, min(drift, 1 + self.maxDrift))
+        now = time.time()
+        displayed = self.time(now)
+        self.base = gameTime
+        self.reference = sampled
+        self.correction = self.target(now) - displayed
+        self.correctionStart = now
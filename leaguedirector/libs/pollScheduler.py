@@ -0,0 +1,47 @@
+import functools
+
+from PySide2.QtCore import QObject, QTimer
+
+
+class PollScheduler(QObject):
+    """
+    Polls every resource on its own timer at the delay the resource asks for,
+    optionally only while a condition holds.
+    """
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self.timers = {}
+        self.conditions = {}
+
+    def add(self, resource, condition=None):
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(functools.partial(self.poll, resource))
+        resource.updated.connect(functools.partial(self.reschedule, resource))
+        self.timers[resource] = timer
+        self.conditions[resource] = condition
+
+    def setCondition(self, resource, condition):
+        self.conditions[resource] = condition
+
+    def start(self):
+        for timer in self.timers.values():
+            timer.start(0)
+
+    def stop(self):
+        for timer in self.timers.values():
+            timer.stop()
+
+    def poll(self, resource):
+        condition = self.conditions.get(resource)
+        if condition is None or condition():
+            resource.update()
+        self.timers[resource].start(resource.pollDelay())
+
+    def reschedule(self, resource):
+        # Pick up a shorter delay right away, eg. once a recording starts
+        timer = self.timers[resource]
+        delay = resource.pollDelay()
+        if timer.isActive() and timer.remainingTime() > delay:
+            timer.start(delay)
@@ -1,12 +1,91 @@
+import time
+
+from leaguedirector.libs.emptyClass import EmptyClass
+from leaguedirector.libs.requestMetrics import RequestMetrics
 from leaguedirector.libs.runnableWithSignals import RunnableWithSignals
+from leaguedirector.libs.sessionPool import SessionPool
 from PySide2.QtCore import Signal
 import os
 
 
 class Request(RunnableWithSignals):
     finished = Signal(object)
+    method = ''
+    connectTimeout = 3.05
+    readTimeout = 10
 
     def __init__(self, endpoint, certPath, parent=None):
         self.endpoint = endpoint
         self.certPath = certPath
+        self.generation = 0
+        self.fields = []
+        self.cancelled = False
+        self.pool = None
         RunnableWithSignals.__init__(self, parent)
+
+    @classmethod
+    def setTimeouts(cls, connect, read):
+        cls.connectTimeout = connect
+        cls.readTimeout = read
+
+    def timeout(self):
+        return self.connectTimeout, self.readTimeout
+
+    def session(self):
+        return SessionPool.get_instance(self.certPath)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def abort(self):
+        """
+        Answer a cancelled request that was taken off the queue before it ran.
+        """
+        res = EmptyClass()
+        res.error = True
+        res.roundTrip = 0.0
+        res.sampled = time.time()
+        self.respond(res)
+
+    def payloadSize(self):
+        return 0
+
+    def run(self):
+        started = time.perf_counter()
+        requested = time.time()
+        try:
+            if self.cancelled:
+                res = EmptyClass()
+                res.error = True
+            else:
+                res = self.send()
+                res.error = False
+        except:
+            res = EmptyClass()
+            res.error = True
+        finally:
+            if self.pool is not None:
+                self.pool.release(self)
+
+        # The server most likely sampled its state halfway through the round trip
+        responded = time.time()
+        res.roundTrip = responded - requested
+        res.sampled = requested + res.roundTrip / 2
+
+        if not self.cancelled:
+            RequestMetrics.get_instance().record(
+                self.method,
+                self.endpoint,
+                time.perf_counter() - started,
+                res.error or res.status_code != 200,
+                self.payloadSize(),
+                0 if res.error else len(res.content),
+            )
+        self.respond(res)
+
+    def respond(self, res):
+        res.method = self.method
+        res.generation = self.generation
+        res.fields = self.fields
+        res.cancelled = self.cancelled
+        self.finished.emit(res)
@@ -0,0 +1,27 @@
+from PySide2.QtCore import QObject, Signal
+
+
+class RequestLane(QObject):
+    """
+    Runs requests one at a time so they reach the server in the order they were issued.
+    """
+    idle = Signal()
+
+    def __init__(self, pool, parent=None):
+        QObject.__init__(self, parent)
+        self.pool = pool
+        self.running = None
+
+    def busy(self):
+        return self.running is not None
+
+    def start(self, request):
+        if self.busy():
+            raise RuntimeError("Request lane is busy")
+        self.running = request
+        request.finished.connect(self.finished)
+        self.pool.start(request)
+
+    def finished(self, *args):
+        self.running = None
+        self.idle.emit()
@@ -0,0 +1,103 @@
+import math
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+from leaguedirector.libs.requestPool import RequestPool
+
+
+class EndpointMetrics(object):
+    """
+    Counters and recent latency samples for one method + endpoint pair.
+    """
+
+    def __init__(self, samples):
+        self.requests = 0
+        self.errors = 0
+        self.bytesSent = 0
+        self.bytesReceived = 0
+        self.latencies = deque(maxlen=samples)
+
+    def record(self, latency, error, sent, received):
+        self.requests += 1
+        self.errors += 1 if error else 0
+        self.bytesSent += sent
+        self.bytesReceived += received
+        self.latencies.append(latency)
+
+    def percentiles(self, *percents):
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return [None for _ in percents]
+        return [ordered[min(int(math.ceil(len(ordered) * percent / 100.0)) - 1, len(ordered) - 1)]
+                for percent in percents]
+
+
+class RequestMetrics(object):
+    """
+    Thread safe latency and throughput statistics of every replay api request.
+    """
+    _instance = None
+    _lock = threading.Lock()
+    sampleSize = 1024
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    @classmethod
+    def get_instance(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = RequestMetrics()
+            return cls._instance
+
+    def record(self, method, endpoint, latency, error, sent=0, received=0):
+        key = '{} {}'.format(method, urlsplit(endpoint).path)
+        with self.lock:
+            if key not in self.endpoints:
+                self.endpoints[key] = EndpointMetrics(self.sampleSize)
+            self.endpoints[key].record(latency, error, sent, received)
+
+    def reset(self):
+        with self.lock:
+            self.endpoints = {}
+
+    def snapshot(self):
+        """
+        One row per endpoint with latencies in milliseconds.
+        """
+        rows = []
+        with self.lock:
+            for key, metrics in sorted(self.endpoints.items()):
+                p50, p95, p99 = metrics.percentiles(50, 95, 99)
+                rows.append({
+                    'endpoint': key,
+                    'requests': metrics.requests,
+                    'errors': metrics.errors,
+                    'p50': p50 and p50 * 1000,
+                    'p95': p95 and p95 * 1000,
+                    'p99': p99 and p99 * 1000,
+                    'bytesSent': metrics.bytesSent,
+                    'bytesReceived': metrics.bytesReceived,
+                })
+        return rows
+
+    def depth(self):
+        return RequestPool.get_instance().depth()
+
+    def log(self):
+        for row in self.snapshot():
+            logging.info(
+                'Replay API %s: %d requests, %d errors, p50 %s p95 %s p99 %s ms, %d bytes sent, %d bytes received',
+                row['endpoint'], row['requests'], row['errors'],
+                self.formatLatency(row['p50']), self.formatLatency(row['p95']), self.formatLatency(row['p99']),
+                row['bytesSent'], row['bytesReceived'],
+            )
+        depth = self.depth()
+        logging.info('Replay API queue depth: %d reads, %d writes', depth['GET'], depth['POST'])
+
+    @staticmethod
+    def formatLatency(value):
+        return '-' if value is None else '{:.1f}'.format(value)
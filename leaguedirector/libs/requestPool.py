@@ -0,0 +1,67 @@
+import threading
+
+from PySide2.QtCore import QThreadPool
+
+
+class RequestPool(object):
+    """
+    Bounded thread pools for replay api traffic, with separate lanes for reads
+    and writes.
+    """
+    _instance = None
+    _lock = threading.Lock()
+    readThreads = 5
+    writeThreads = 4
+
+    def __init__(self):
+        self.reads = QThreadPool()
+        self.reads.setMaxThreadCount(self.readThreads)
+        self.writes = QThreadPool()
+        self.writes.setMaxThreadCount(self.writeThreads)
+        self.lock = threading.Lock()
+        self.requests = set()
+
+    @classmethod
+    def get_instance(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = RequestPool()
+            return cls._instance
+
+    def size(self):
+        return self.reads.maxThreadCount() + self.writes.maxThreadCount()
+
+    def start(self, request):
+        with self.lock:
+            self.requests.add(request)
+        request.pool = self
+        if request.method == 'GET':
+            self.reads.start(request)
+        else:
+            self.writes.start(request)
+
+    def release(self, request):
+        with self.lock:
+            self.requests.discard(request)
+
+    def depth(self):
+        """
+        Number of requests queued or running, by method.
+        """
+        with self.lock:
+            reads = sum(1 for request in self.requests if request.method == 'GET')
+            return {'GET': reads, 'POST': len(self.requests) - reads}
+
+    def cancelAll(self):
+        """
+        Cancel every request that hasn't finished yet, answering queued ones
+        straight away.
+        """
+        with self.lock:
+            requests = list(self.requests)
+        for request in requests:
+            request.cancel()
+            pool = self.reads if request.method == 'GET' else self.writes
+            if pool.tryTake(request):
+                self.release(request)
+                request.abort()
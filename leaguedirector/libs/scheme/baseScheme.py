@@ -1,7 +1,10 @@
 from marshmallow import Schema, INCLUDE
+import functools
 import json
 import os
 
+from leaguedirector.libs.fileWriter import FileWriter
+
 
 class BaseSchema(Schema):
     class Meta:
@@ -12,6 +15,7 @@ class BaseSchema(Schema):
         return self.dumps(obj)
 
     def loadFromJsonFile(self, jsonFilePath: str):
+        FileWriter.get_instance().flush(jsonFilePath)
         if not os.path.isfile(jsonFilePath):
             raise Exception(f"cant not find {jsonFilePath}")
         with open(jsonFilePath, 'r', encoding='UTF8') as f:
@@ -20,5 +24,4 @@ class BaseSchema(Schema):
         return self.load(obj)
 
     def saveToJson(self, jsonPath: str, obj):
-        with open(jsonPath, 'w') as f:
-            f.write(self.dumps(obj))
+        FileWriter.get_instance().write(jsonPath, functools.partial(self.dumps, obj))
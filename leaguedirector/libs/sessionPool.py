@@ -0,0 +1,65 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.ssl_ import create_urllib3_context
+
+from leaguedirector.libs.requestPool import RequestPool
+
+
+class CertificateAdapter(HTTPAdapter):
+    """
+    Http adapter that hands the same ssl context to every pooled connection.
+    """
+
+    def __init__(self, sslContext, **kwargs):
+        self.sslContext = sslContext
+        HTTPAdapter.__init__(self, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.sslContext
+        return HTTPAdapter.init_poolmanager(self, *args, **kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        HTTPAdapter.cert_verify(self, conn, url, verify, cert)
+        if url.lower().startswith('https') and verify:
+            # The shared context already trusts the certificate, don't reload it for each connection
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+
+class SessionPool(object):
+    """
+    Keep-alive http session shared by every replay api request.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, certPath, size):
+        self.certPath = certPath
+        self.size = size
+        self.session = requests.Session()
+        self.session.verify = certPath
+        self.session.mount('https://', CertificateAdapter(
+            self.createSslContext(certPath),
+            pool_connections=2,
+            pool_maxsize=size,
+        ))
+
+    @classmethod
+    def get_instance(cls, certPath):
+        with cls._lock:
+            if cls._instance is None or cls._instance.certPath != certPath:
+                cls._instance = SessionPool(certPath, RequestPool.get_instance().size())
+            return cls._instance
+
+    def createSslContext(self, certPath):
+        context = create_urllib3_context()
+        context.load_verify_locations(cafile=certPath)
+        return context
+
+    def get(self, endpoint, **kwargs):
+        return self.session.get(endpoint, **kwargs)
+
+    def post(self, endpoint, **kwargs):
+        return self.session.post(endpoint, **kwargs)
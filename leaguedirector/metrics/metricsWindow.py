@@ -0,0 +1,56 @@
+from PySide2.QtCore import Qt
+from PySide2.QtWidgets import QLabel, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+
+from leaguedirector.libs.requestMetrics import RequestMetrics
+from leaguedirector.widgets import VBoxWidget, HBoxWidget, schedule
+
+
+class MetricsWindow(VBoxWidget):
+    columns = [
+        ('endpoint', 'Endpoint'),
+        ('requests', 'Requests'),
+        ('errors', 'Errors'),
+        ('p50', 'p50 ms'),
+        ('p95', 'p95 ms'),
+        ('p99', 'p99 ms'),
+        ('bytesSent', 'Sent'),
+        ('bytesReceived', 'Received'),
+    ]
+
+    def __init__(self, api):
+        VBoxWidget.__init__(self)
+        self.api = api
+        self.metrics = RequestMetrics.get_instance()
+        self.depth = QLabel()
+        self.skipped = QLabel()
+        self.reset = QPushButton('Reset')
+        self.reset.setMaximumWidth(80)
+        self.reset.clicked.connect(self.metrics.reset)
+        self.table = QTableWidget(0, len(self.columns))
+        self.table.setHorizontalHeaderLabels([label for _, label in self.columns])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.addWidget(HBoxWidget(self.depth, self.skipped, self.reset))
+        self.addWidget(self.table)
+        self.setWindowTitle('Replay API Metrics')
+        self.timer = schedule(1000, self.refresh)
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        depth = self.metrics.depth()
+        self.depth.setText('Queued: {} reads, {} writes'.format(depth['GET'], depth['POST']))
+        resources = [self.api.game, self.api.render, self.api.particles, self.api.playback, self.api.recording]
+        self.skipped.setText('Skipped polls: {}'.format(sum(resource.skippedPolls for resource in resources)))
+        rows = self.metrics.snapshot()
+        self.table.setRowCount(len(rows))
+        for index, row in enumerate(rows):
+            for column, (key, _) in enumerate(self.columns):
+                value = row[key]
+                if key in ('p50', 'p95', 'p99'):
+                    value = RequestMetrics.formatLatency(value)
+                item = QTableWidgetItem(str(value))
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(index, column, item)
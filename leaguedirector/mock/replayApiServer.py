@@ -0,0 +1,300 @@
+"""
+Local stand-in for the game's Replay API.
+
+Serves the same endpoints and field schemas as the resources in
+leaguedirector.api so the client can be developed and benchmarked on
+machines that can't run the game:
+
+    python -m leaguedirector.mock.replayApiServer --port 2999 --latency 0.01 --jitter 0.005
+
+Point the client at the generated certificate with LEAGUEDIRECTOR_CERT.
+Request counters are available from /mock/stats and can be reset with a
+POST to the same path.
+"""
+import os
+import ssl
+import sys
+import copy
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from leaguedirector.api import Game, Render, Particles, Playback, Recording, Sequence
+
+
+class SimulatedClock(object):
+    """
+    Replay clock advancing with wall time according to speed and pause state.
+    """
+
+    def __init__(self, length, seekDuration):
+        self.length = length
+        self.seekDuration = seekDuration
+        self.speed = 1.0
+        self.paused = False
+        self.origin = 0.0
+        self.started = time.monotonic()
+        self.seekUntil = 0.0
+
+    def time(self):
+        if self.paused or self.seeking():
+            return self.origin
+        return min(self.origin + (time.monotonic() - self.started) * self.speed, self.length)
+
+    def seeking(self):
+        return time.monotonic() < self.seekUntil
+
+    def rebase(self):
+        self.origin = self.time()
+        # Playback resumes from origin once a seek in progress is done
+        self.started = max(time.monotonic(), self.seekUntil)
+
+    def seek(self, value):
+        self.origin = max(0.0, min(float(value), self.length))
+        self.seekUntil = time.monotonic() + self.seekDuration
+        self.started = self.seekUntil
+
+    def setSpeed(self, speed):
+        self.rebase()
+        self.speed = float(speed)
+
+    def setPaused(self, paused):
+        self.rebase()
+        self.paused = bool(paused)
+
+
+class ReplayState(object):
+    """
+    Thread safe in memory state for every endpoint.
+    """
+
+    def __init__(self, length, seekDuration, particleCount):
+        self.lock = threading.Lock()
+        self.clock = SimulatedClock(length, seekDuration)
+        self.game = dict(Game.fields, processID=os.getpid())
+        self.render = copy.deepcopy(Render.fields)
+        self.render.update({
+            'cameraMode': 'fps',
+            'cameraMoveSpeed': 2000.0,
+            'cameraLookSpeed': 1.0,
+            'fieldOfView': 45.0,
+            'nearClip': 50.0,
+            'farClip': 50000.0,
+        })
+        self.particles = {'particle_{:04}'.format(index): True for index in range(particleCount)}
+        self.recording = copy.deepcopy(Recording.fields)
+        self.recordingStarted = 0.0
+        self.sequence = {key: [] for key in Sequence.fields}
+        self.stats = {}
+
+    def get(self, path):
+        with self.lock:
+            return self.encode(self.read(path))
+
+    def post(self, path, data):
+        with self.lock:
+            return self.encode(self.write(path, data))
+
+    def encode(self, data):
+        return None if data is None else json.dumps(data)
+
+    def read(self, path):
+        if path == Game.url:
+            return self.game
+        if path == Render.url:
+            return self.render
+        if path == Particles.url:
+            return self.particles
+        if path == Playback.url:
+            return self.playback()
+        if path == Recording.url:
+            return self.updateRecording()
+        if path == Sequence.url:
+            return self.sequence
+        if path == '/mock/stats':
+            return self.stats
+        return None
+
+    def write(self, path, data):
+        if path == Render.url:
+            return self.merge(self.render, data)
+        if path == Particles.url:
+            return self.merge(self.particles, data)
+        if path == Playback.url:
+            return self.setPlayback(data)
+        if path == Recording.url:
+            return self.setRecording(data)
+        if path == Sequence.url:
+            self.sequence = {key: data.get(key, []) for key in Sequence.fields}
+            return self.sequence
+        if path == '/mock/stats':
+            self.stats = {}
+            return self.stats
+        return None
+
+    def merge(self, target, data):
+        for key, value in data.items():
+            if key in target:
+                target[key] = value
+        return target
+
+    def playback(self):
+        return {
+            'paused': self.clock.paused,
+            'seeking': self.clock.seeking(),
+            'time': self.clock.time(),
+            'speed': self.clock.speed,
+            'length': self.clock.length,
+        }
+
+    def setPlayback(self, data):
+        if 'speed' in data:
+            self.clock.setSpeed(data['speed'])
+        if 'paused' in data:
+            self.clock.setPaused(data['paused'])
+        if 'time' in data:
+            self.clock.seek(data['time'])
+        return self.playback()
+
+    def setRecording(self, data):
+        self.merge(self.recording, data)
+        if data.get('recording'):
+            self.recording['currentTime'] = self.recording['startTime']
+            self.recordingStarted = time.monotonic()
+        return self.updateRecording()
+
+    def updateRecording(self):
+        if self.recording['recording']:
+            elapsed = (time.monotonic() - self.recordingStarted) * (self.recording['replaySpeed'] or 1.0)
+            self.recording['currentTime'] = self.recording['startTime'] + elapsed
+            if self.recording['currentTime'] >= self.recording['endTime']:
+                self.recording['currentTime'] = self.recording['endTime']
+                self.recording['recording'] = False
+        return self.recording
+
+    def count(self, method, path, received, sent):
+        with self.lock:
+            entry = self.stats.setdefault('{} {}'.format(method, path), {
+                'requests': 0,
+                'bytesReceived': 0,
+                'bytesSent': 0,
+            })
+            entry['requests'] += 1
+            entry['bytesReceived'] += received
+            entry['bytesSent'] += sent
+
+
+class ReplayApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.delay()
+        self.respond('GET', self.server.state.get(self.path), 0)
+
+    def do_POST(self):
+        self.delay()
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        try:
+            data = json.loads(body.decode() or '{}')
+        except ValueError:
+            return self.respond('POST', None, length, 400)
+        if not isinstance(data, dict):
+            return self.respond('POST', None, length, 400)
+        self.respond('POST', self.server.state.post(self.path, data), length)
+
+    def delay(self):
+        latency = self.server.latency + random.uniform(-self.server.jitter, self.server.jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+    def respond(self, method, body, received, status=200):
+        if body is None and status == 200:
+            status = 404
+        if status != 200:
+            body = json.dumps({'error': status})
+        body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.state.count(method, self.path, received, len(body))
+
+    def log_message(self, format, *args):
+        logging.debug('(MOCK) ' + format, *args)
+
+
+class ReplayApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state, latency=0.0, jitter=0.0):
+        ThreadingHTTPServer.__init__(self, address, ReplayApiHandler)
+        self.state = state
+        self.latency = latency
+        self.jitter = jitter
+
+    def enableSsl(self, certPath, keyPath):
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certPath, keyPath)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+
+
+def createSelfSignedCertificate(directory):
+    """
+    Create a self signed certificate for 127.0.0.1 with the openssl command line tool.
+    """
+    certPath = os.path.join(directory, 'mock.pem')
+    keyPath = os.path.join(directory, 'mock.key')
+    subprocess.check_call([
+        'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '30',
+        '-subj', '/CN=127.0.0.1',
+        '-addext', 'subjectAltName=IP:127.0.0.1,DNS:localhost',
+        '-keyout', keyPath, '-out', certPath,
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return certPath, keyPath
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local stand-in for the League of Legends Replay API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2999)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- seconds added to the latency')
+    parser.add_argument('--length', type=float, default=1800.0, help='Length of the simulated replay in seconds')
+    parser.add_argument('--seek', type=float, default=0.5, help='Seconds the playback reports seeking after a jump')
+    parser.add_argument('--particles', type=int, default=500, help='Number of fake particles to report')
+    parser.add_argument('--cert', help='Certificate to serve, a self signed one is created when omitted')
+    parser.add_argument('--key', help='Private key for --cert')
+    parser.add_argument('--insecure', action='store_true', help='Serve plain http')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)-8s] %(message)s')
+    state = ReplayState(args.length, args.seek, args.particles)
+    server = ReplayApiServer((args.host, args.port), state, args.latency, args.jitter)
+    scheme = 'http'
+    if not args.insecure:
+        certPath, keyPath = args.cert, args.key
+        if certPath is None:
+            certPath, keyPath = createSelfSignedCertificate(tempfile.mkdtemp(prefix='leaguedirector-mock-'))
+        server.enableSsl(certPath, keyPath or certPath)
+        scheme = 'https'
+        logging.info('Certificate: %s (export LEAGUEDIRECTOR_CERT to trust it)', certPath)
+    logging.info('Mock Replay API listening on %s://%s:%d', scheme, args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,4 @@
+from leaguedirector.libs.requestPool import RequestPool
 from leaguedirector.utils import find_procs_by_name, find_port_by_pid
 
 
@@ -21,6 +22,9 @@ class ReplayApiHostSingleton:
         return self._host
 
     def set_host(self, host):
+        if host != self._host:
+            # Anything still queued was meant for the previous game
+            RequestPool.get_instance().cancelAll()
         self._host = host
         return self
 
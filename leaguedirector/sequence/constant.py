@@ -1,4 +1,6 @@
 PRECISION = 10000.0
 SNAPPING = 4
 OVERLAP = 4
-ADJACENT = 0.05
\ No newline at end of file
+ADJACENT = 0.05
+# Tracks that define where a sequence starts and ends
+TIMING_TRACKS = ('cameraPosition', 'cameraRotation')
\ No newline at end of file
@@ -0,0 +1,67 @@
+import copy
+
+
+class Keyframe(object):
+    """
+    Dict like view of one keyframe in a KeyframeTrack, with a stable identity
+    while something holds on to it.
+    """
+    __slots__ = ('track', 'key', 'time', '__weakref__')
+
+    def __init__(self, track, key, time):
+        self.track = track
+        self.key = key
+        self.time = time
+
+    def __getitem__(self, name):
+        value = self.track.field(self, name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        self.track.setField(self, name, value)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __repr__(self):
+        return 'Keyframe({!r})'.format(dict(self))
+
+    def get(self, name, default=None):
+        value = self.track.field(self, name)
+        return default if value is None else value
+
+    def keys(self):
+        if self.get('blend') is None:
+            return ['time', 'value']
+        return ['time', 'value', 'blend']
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+
+class KeyframeData(object):
+    """
+    Stands in for the track of a view whose keyframe has been removed.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def field(self, item, name):
+        return self.data.get(name)
+
+    def setField(self, item, name, value):
+        self.data[name] = value
+        if name == 'time':
+            item.time = value
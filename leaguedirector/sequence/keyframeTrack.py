@@ -0,0 +1,375 @@
+import itertools
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from numbers import Real
+
+from leaguedirector.sequence.keyframe import Keyframe, KeyframeData
+from leaguedirector.sequence.rawKeyframeTrack import RawKeyframeTrack
+
+COMPONENTS = {
+    'float': None,
+    'bool': None,
+    'vector': ('x', 'y', 'z'),
+    'color': ('r', 'g', 'b', 'a'),
+}
+
+# Blend names are stored as indexes into this table, None means no blend key
+BLENDS = [None]
+
+# Doubles hold every integer up to this exactly
+MAX_EXACT = 2 ** 53
+
+keyCounter = itertools.count(1)
+
+
+def blendId(blend):
+    if blend not in BLENDS:
+        BLENDS.append(blend)
+    return BLENDS.index(blend)
+
+
+def kindOf(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, Real):
+        return 'float'
+    if isinstance(value, dict):
+        for kind in ('vector', 'color'):
+            if set(value) == set(COMPONENTS[kind]):
+                if all(isinstance(value[name], Real) and not isinstance(value[name], bool) for name in value):
+                    return kind
+    return None
+
+
+def exact(number):
+    return type(number) is not int or abs(number) <= MAX_EXACT
+
+
+def fits(keyframe, kind):
+    return (
+        isinstance(keyframe, dict)
+        and 'time' in keyframe and 'value' in keyframe
+        and set(keyframe) <= {'time', 'value', 'blend'}
+        and isinstance(keyframe['time'], Real) and not isinstance(keyframe['time'], bool)
+        and kindOf(keyframe['value']) == kind
+        and isinstance(keyframe.get('blend', ''), str)
+        and exact(keyframe['time'])
+        and all(exact(number) for number in (keyframe['value'].values() if kind in ('vector', 'color')
+                                             else [keyframe['value']]))
+    )
+
+
+def createTrack(keyframes):
+    """
+    Columnar track for keyframes that fit one, raw dicts for anything else.
+    """
+    keyframes = list(keyframes)
+    kind = kindOf(keyframes[0].get('value')) if keyframes and isinstance(keyframes[0], dict) else None
+    if not keyframes or (kind is not None and all(fits(keyframe, kind) for keyframe in keyframes)):
+        return KeyframeTrack(keyframes)
+    return RawKeyframeTrack(keyframes)
+
+
+class KeyframeTrack(object):
+    """
+    Keyframes of one sequence track stored in flat arrays sorted by time.
+    """
+
+    def __init__(self, keyframes=()):
+        self.revision = 0
+        self.dirty = {}
+        self.reset()
+        for keyframe in sorted(keyframes, key=lambda item: item['time']):
+            self.append(keyframe)
+        # Building the track isn't an edit
+        self.dirty = {}
+
+    def __iter__(self):
+        return (self.view(index) for index in range(len(self.times)))
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.view(i) for i in range(*index.indices(len(self.times)))]
+        if index < 0:
+            index += len(self.times)
+        if not 0 <= index < len(self.times):
+            raise IndexError(index)
+        return self.view(index)
+
+    def __contains__(self, item):
+        return self.find(item) is not None
+
+    @property
+    def width(self):
+        return len(COMPONENTS[self.kind] or (None,))
+
+    def clear(self):
+        for index, key in enumerate(self.keys):
+            self.touch(key, index)
+        self.reset()
+
+    def reset(self):
+        self.kind = None
+        self.times = array('d')
+        self.values = array('d')
+        self.blends = array('H')
+        self.keys = array('Q')
+        self.ints = array('B')
+        self.views = weakref.WeakValueDictionary()
+        self.revision += 1
+
+    def view(self, index):
+        key = self.keys[index]
+        item = self.views.get(key)
+        if item is None:
+            item = Keyframe(self, key, self.times[index])
+            self.views[key] = item
+        return item
+
+    def pack(self, value):
+        components = COMPONENTS[self.kind]
+        if components is None:
+            return [float(value)]
+        return [float(value[name]) for name in components]
+
+    def intFlags(self, value, time=None):
+        """
+        Bit 0 set when time is an int, bit i + 1 when value component i is.
+        """
+        components = COMPONENTS[self.kind]
+        numbers = [value] if components is None else [value[name] for name in components]
+        flags = 1 if type(time) is int else 0
+        for component, number in enumerate(numbers):
+            if type(number) is int:
+                flags |= 2 << component
+        return flags
+
+    def unpack(self, index):
+        width = self.width
+        flags = self.ints[index]
+        values = [
+            int(number) if flags & (2 << component) else number
+            for component, number in enumerate(self.values[index * width:(index + 1) * width])
+        ]
+        components = COMPONENTS[self.kind]
+        if components is not None:
+            return dict(zip(components, values))
+        if self.kind == 'bool':
+            return bool(values[0])
+        return values[0]
+
+    def time(self, index):
+        return int(self.times[index]) if self.ints[index] & 1 else self.times[index]
+
+    def dict(self, index):
+        keyframe = {'time': self.time(index), 'value': self.unpack(index)}
+        blend = BLENDS[self.blends[index]]
+        if blend is not None:
+            keyframe['blend'] = blend
+        return keyframe
+
+    def list(self):
+        return [self.dict(index) for index in range(len(self.times))]
+
+    def touch(self, key, index=None):
+        """
+        Call before changing a keyframe, index None for one being added.
+        """
+        self.revision += 1
+        if key not in self.dirty:
+            self.dirty[key] = None if index is None else self.dict(index)
+
+    def takeDirty(self):
+        """
+        Keys changed since the last call mapped to their keyframe before the
+        first of those changes, None for keyframes that were added.
+        """
+        dirty, self.dirty = self.dirty, {}
+        return dirty
+
+    def insertRow(self, item, key):
+        if self.kind is None:
+            self.kind = kindOf(item['value']) or 'float'
+        time = float(item['time'])
+        index = bisect_right(self.times, time)
+        width = self.width
+        self.times.insert(index, time)
+        self.values[index * width:index * width] = array('d', self.pack(item['value']))
+        self.blends.insert(index, blendId(item.get('blend')))
+        self.keys.insert(index, key)
+        self.ints.insert(index, self.intFlags(item['value'], item['time']))
+        return index
+
+    def removeRow(self, index):
+        width = self.width
+        del self.times[index]
+        del self.values[index * width:(index + 1) * width]
+        del self.blends[index]
+        del self.keys[index]
+        del self.ints[index]
+
+    def append(self, item):
+        """
+        Store a copy of a keyframe dict and return its view.
+        """
+        key = next(keyCounter)
+        self.touch(key)
+        return self.view(self.insertRow(item, key))
+
+    def find(self, item):
+        """
+        Index of the keyframe this view points at, None if it isn't in this track.
+        """
+        if not isinstance(item, Keyframe) or item.track is not self:
+            return None
+        start = bisect_left(self.times, item.time)
+        end = bisect_right(self.times, item.time)
+        for index in range(start, end):
+            if self.keys[index] == item.key:
+                return index
+        return None
+
+    def index(self, item):
+        index = self.find(item)
+        if index is None:
+            raise ValueError('Keyframe is not in this track')
+        return index
+
+    def locate(self, key, time=None):
+        """
+        Index of the keyframe with this key, None if there is none. Searching
+        by time when it is known or a view holds it saves a full scan.
+        """
+        item = self.views.get(key) if time is None else None
+        if item is not None:
+            time = item.time
+        if time is not None:
+            for index in range(bisect_left(self.times, time), bisect_right(self.times, time)):
+                if self.keys[index] == key:
+                    return index
+        try:
+            return self.keys.index(key)
+        except ValueError:
+            return None
+
+    def locateAll(self, keys):
+        """
+        Index of the keyframe with each key, None for keys that aren't in the track.
+        """
+        if len(keys) > 16:
+            # One pass over the keys beats a search per key
+            positions = {key: index for index, key in enumerate(self.keys)}
+            return {key: positions.get(key) for key in keys}
+        return {key: self.locate(key) for key in keys}
+
+    def remove(self, item):
+        index = self.index(item)
+        self.touch(item.key, index)
+        # Let the view keep answering with the values it had
+        item.track = KeyframeData(self.dict(index))
+        self.views.pop(item.key, None)
+        self.removeRow(index)
+
+    def retime(self, item, time):
+        index = self.index(item)
+        self.touch(item.key, index)
+        flags = (self.ints[index] & ~1) | (1 if type(time) is int else 0)
+        time = float(time)
+        width = self.width
+        value = self.values[index * width:(index + 1) * width]
+        blend = self.blends[index]
+        del self.times[index]
+        del self.values[index * width:(index + 1) * width]
+        del self.blends[index]
+        del self.keys[index]
+        del self.ints[index]
+        index = bisect_right(self.times, time)
+        self.times.insert(index, time)
+        self.values[index * width:index * width] = value
+        self.blends.insert(index, blend)
+        self.keys.insert(index, item.key)
+        self.ints.insert(index, flags)
+        item.time = time
+
+    def patch(self, changes):
+        """
+        Apply keyframe changes recorded by SequenceHistory, a dict of key to
+        the old and new keyframe dict, None where the keyframe didn't exist.
+        Views of keyframes that change stay attached and follow them.
+        """
+        for key, (old, new) in changes.items():
+            index = self.locate(key, None if old is None else float(old['time']))
+            self.touch(key, index)
+            if index is not None:
+                self.removeRow(index)
+            item = self.views.get(key)
+            if new is not None:
+                self.insertRow(new, key)
+                if item is not None:
+                    item.time = float(new['time'])
+            elif item is not None:
+                item.track = KeyframeData(dict(old))
+                self.views.pop(key, None)
+
+    def field(self, item, name):
+        index = self.index(item)
+        if name == 'time':
+            return self.time(index)
+        if name == 'value':
+            return self.unpack(index)
+        if name == 'blend':
+            return BLENDS[self.blends[index]]
+        return None
+
+    def setField(self, item, name, value):
+        if name == 'time':
+            self.retime(item, value)
+            return
+        index = self.index(item)
+        self.touch(item.key, index)
+        if name == 'value':
+            width = self.width
+            self.values[index * width:(index + 1) * width] = array('d', self.pack(value))
+            self.ints[index] = (self.ints[index] & 1) | self.intFlags(value)
+        elif name == 'blend':
+            self.blends[index] = blendId(value)
+        else:
+            raise KeyError(name)
+
+    @property
+    def startTime(self):
+        return self.times[0] if self.times else None
+
+    @property
+    def endTime(self):
+        return self.times[-1] if self.times else None
+
+    def range(self, start, end):
+        """
+        Keyframes with start <= time <= end.
+        """
+        return [self.view(index) for index in range(bisect_left(self.times, start), bisect_right(self.times, end))]
+
+    def next(self, time):
+        """
+        First keyframe strictly after time.
+        """
+        index = bisect_right(self.times, time)
+        return self.view(index) if index < len(self.times) else None
+
+    def prev(self, time):
+        """
+        Last keyframe strictly before time.
+        """
+        index = bisect_left(self.times, time)
+        return self.view(index - 1) if index > 0 else None
+
+    def columns(self):
+        """
+        Times, values with one row per keyframe and blend names, for bulk readers.
+        """
+        return self.times, self.values, self.width, [BLENDS[blend] for blend in self.blends]
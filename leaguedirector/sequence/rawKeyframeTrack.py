@@ -0,0 +1,104 @@
+from bisect import bisect_left, bisect_right
+
+
+class RawKeyframeTrack(object):
+    """
+    Keyframes of one sequence track kept sorted by time as plain dicts, for
+    tracks that don't fit a KeyframeTrack. Change 'time' only through retime.
+    """
+
+    def __init__(self, keyframes=()):
+        keyframes = sorted(keyframes, key=lambda item: item['time'])
+        self.items = keyframes
+        self.times = [item['time'] for item in keyframes]
+        self.revision = 0
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __contains__(self, item):
+        return self.find(item) is not None
+
+    def list(self):
+        return [dict(item) for item in self.items]
+
+    def clear(self):
+        self.items = []
+        self.times = []
+        self.revision += 1
+
+    def append(self, item):
+        index = bisect_right(self.times, item['time'])
+        self.times.insert(index, item['time'])
+        self.items.insert(index, item)
+        self.revision += 1
+        return item
+
+    def find(self, item):
+        """
+        Index of this exact keyframe object, comparing identity rather than value.
+        """
+        start = bisect_left(self.times, item['time'])
+        end = bisect_right(self.times, item['time'])
+        for index in range(start, end):
+            if self.items[index] is item:
+                return index
+        for index, other in enumerate(self.items):
+            # The time was changed behind our back, fall back to a full scan
+            if other is item:
+                return index
+        return None
+
+    def remove(self, item):
+        index = self.find(item)
+        if index is None:
+            raise ValueError('Keyframe is not in this track')
+        del self.times[index]
+        del self.items[index]
+        self.revision += 1
+
+    def retime(self, item, time):
+        self.remove(item)
+        item['time'] = time
+        self.append(item)
+
+    def setField(self, item, name, value):
+        if name == 'time':
+            self.retime(item, value)
+        else:
+            item[name] = value
+            self.revision += 1
+
+    @property
+    def startTime(self):
+        return self.times[0] if self.times else None
+
+    @property
+    def endTime(self):
+        return self.times[-1] if self.times else None
+
+    def range(self, start, end):
+        """
+        Keyframes with start <= time <= end.
+        """
+        return self.items[bisect_left(self.times, start):bisect_right(self.times, end)]
+
+    def next(self, time):
+        """
+        First keyframe strictly after time.
+        """
+        index = bisect_right(self.times, time)
+        return self.items[index] if index < len(self.items) else None
+
+    def prev(self, time):
+        """
+        Last keyframe strictly before time.
+        """
+        index = bisect_left(self.times, time)
+        return self.items[index - 1] if index > 0 else None
@@ -0,0 +1,37 @@
+from collections import OrderedDict
+
+
+class SequenceCache(object):
+    """
+    Tracks, undo history and journal of recently opened sequences, least
+    recently used first.
+    """
+    maxEntries = 8
+
+    def __init__(self, maxEntries=None):
+        self.maxEntries = maxEntries or self.maxEntries
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, path):
+        return path in self.entries
+
+    def put(self, path, state):
+        self.entries.pop(path, None)
+        self.entries[path] = state
+        while len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+
+    def take(self, path):
+        """
+        Remove and return the state cached for path, None if there isn't one.
+        """
+        return self.entries.pop(path, None)
+
+    def discard(self, path):
+        self.entries.pop(path, None)
+
+    def clear(self):
+        self.entries.clear()
@@ -1,23 +1,100 @@
-from PySide2.QtWidgets import QComboBox
+import time
+
+from PySide2.QtCore import Qt
+from PySide2.QtWidgets import QComboBox, QCompleter, QActionGroup
 
 
 class SequenceCombo(QComboBox):
+    sortOptions = [
+        ('Name', 'name'),
+        ('Last Modified', 'mtime'),
+        ('Duration', 'duration'),
+        ('Keyframes', 'keyframes'),
+    ]
+
     def __init__(self, api):
         QComboBox.__init__(self)
         self.api = api
+        self.sortKey = 'name'
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.NoInsert)
+        self.completer().setCompletionMode(QCompleter.PopupCompletion)
+        self.completer().setFilterMode(Qt.MatchContains)
+        self.completer().setCaseSensitivity(Qt.CaseInsensitive)
+        self.lineEdit().setPlaceholderText('Search sequences')
+        self.lineEdit().setContextMenuPolicy(Qt.CustomContextMenu)
+        self.lineEdit().customContextMenuRequested.connect(self.showContextMenu)
         self.update()
         self.api.sequence.namesLoaded.connect(self.update)
+        self.api.sequence.library.entriesChanged.connect(self.updateEntries)
         self.activated.connect(self.onActivated)
 
     def onActivated(self, index):
         self.api.sequence.load(self.itemText(index))
 
-    def showPopup(self):
-        self.api.sequence.reloadNames()
-        QComboBox.showPopup(self)
+    def showContextMenu(self, position):
+        menu = self.lineEdit().createStandardContextMenu()
+        menu.addSeparator()
+        sortMenu = menu.addMenu('Sort By')
+        group = QActionGroup(sortMenu)
+        for label, key in self.sortOptions:
+            action = sortMenu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(key == self.sortKey)
+            action.setData(key)
+            group.addAction(action)
+        action = menu.exec_(self.lineEdit().mapToGlobal(position))
+        if action is not None and action.actionGroup() is group:
+            self.setSortKey(action.data())
+
+    def setSortKey(self, key):
+        self.sortKey = key
+        self.update()
+
+    def tooltip(self, name):
+        entry = self.api.sequence.library.entry(name)
+        lines = []
+        if entry.get('duration') is not None:
+            lines.append('Time: {:.2f} - {:.2f} ({:.2f}s)'.format(entry['startTime'], entry['endTime'], entry['duration']))
+        if entry.get('keyframes') is not None:
+            lines.append('Keyframes: {}'.format(entry['keyframes']))
+        if entry.get('mtime') is not None:
+            lines.append('Modified: {}'.format(time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['mtime']))))
+        return '\n'.join(lines)
 
     def update(self):
-        self.clear()
-        for name in self.api.sequence.names:
-            self.addItem(name)
-        self.setCurrentIndex(self.api.sequence.index)
\ No newline at end of file
+        """
+        Bring the rows in line with the sequence names, moving, adding and
+        removing rows in place so the search text isn't lost.
+        """
+        names = self.api.sequence.library.sorted(self.api.sequence.names, self.sortKey)
+        if self.api.sequence.name and self.api.sequence.name not in names:
+            # Not listed yet, show it rather than a blank combo
+            names.append(self.api.sequence.name)
+        text = self.lineEdit().text()
+        wanted = set(names)
+        for index in reversed(range(self.count())):
+            if self.itemText(index) not in wanted:
+                self.removeItem(index)
+        for index, name in enumerate(names):
+            if index < self.count() and self.itemText(index) == name:
+                continue
+            row = self.findText(name)
+            if row < 0:
+                self.insertItem(index, name)
+                self.setItemData(index, self.tooltip(name), Qt.ToolTipRole)
+            else:
+                self.model().insertRow(index, self.model().takeRow(row))
+        if self.lineEdit().hasFocus():
+            # Don't replace what is being typed
+            self.lineEdit().setText(text)
+        else:
+            self.setCurrentIndex(self.findText(self.api.sequence.name))
+
+    def updateEntries(self, names):
+        for name in names:
+            index = self.findText(name)
+            if index >= 0:
+                self.setItemData(index, self.tooltip(name), Qt.ToolTipRole)
+        if self.sortKey != 'name':
+            self.update()
@@ -0,0 +1,119 @@
+from operator import itemgetter
+
+import numpy as np
+
+from leaguedirector.libs.easing import ease
+
+VECTOR = ('x', 'y', 'z')
+COLOR = ('r', 'g', 'b', 'a')
+
+
+class SequenceEvaluator(object):
+    """
+    Evaluates sequence tracks locally with the same blending the game applies.
+    """
+
+    def __init__(self, sequence):
+        self.sequence = sequence
+
+    def evaluate(self, name, times):
+        """
+        Values of a track at every time in 'times'. Floats and booleans come
+        back as a 1d array, vectors and colors as one row per time with the
+        components in x, y, z or r, g, b, a order. Returns None when the track
+        has no keyframes.
+        """
+        return evaluateKeyframes(self.sequence.getKeyframes(name), times)
+
+    def valueAt(self, name, time):
+        """
+        Value of a track at a single time in the same format as the keyframes.
+        """
+        keyframes = self.sequence.getKeyframes(name)
+        result = evaluateKeyframes(keyframes, [time])
+        if result is None:
+            return None
+        return unpack(keyframes[0]['value'], result[0])
+
+    def sample(self, name, start, end, count):
+        """
+        Evenly spaced times between start and end with the track values at each.
+        """
+        times = np.linspace(start, end, count)
+        return times, self.evaluate(name, times)
+
+
+def components(value):
+    if isinstance(value, dict):
+        return COLOR if 'r' in value else VECTOR
+    return None
+
+
+def pack(value, keys):
+    if keys is None:
+        return float(value)
+    return [float(value.get(key, 0)) for key in keys]
+
+
+def unpack(example, value):
+    keys = components(example)
+    if keys is not None:
+        return {key: float(component) for key, component in zip(keys, value)}
+    if isinstance(example, bool):
+        return bool(value)
+    return float(value)
+
+
+def columns(keyframes):
+    """
+    Sorted times, values and blend names of a track as numpy arrays.
+    """
+    if hasattr(keyframes, 'columns'):
+        # Columnar tracks already hold sorted arrays, copy them in one go
+        # rather than holding a buffer that would stop the track from resizing
+        times, values, width, blends = keyframes.columns()
+        values = np.array(values, dtype=float)
+        if components(keyframes[0]['value']) is not None:
+            values = values.reshape(-1, width)
+        return np.array(times, dtype=float), values, np.array(blends, dtype=object)
+    keyframes = sorted(keyframes, key=itemgetter('time'))
+    keys = components(keyframes[0]['value'])
+    times = np.array([keyframe['time'] for keyframe in keyframes], dtype=float)
+    values = np.array([pack(keyframe['value'], keys) for keyframe in keyframes], dtype=float)
+    blends = np.array([keyframe.get('blend', 'linear') for keyframe in keyframes], dtype=object)
+    return times, values, blends
+
+
+def evaluateKeyframes(keyframes, times):
+    if not keyframes:
+        return None
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    example = keyframes[0]['value']
+    keys = components(example)
+    keyTimes, values, blends = columns(keyframes)
+
+    # Index of the keyframe each time falls after, -1 before the first keyframe
+    index = np.searchsorted(keyTimes, times, side='right') - 1
+
+    if isinstance(example, bool):
+        return values[np.clip(index, 0, len(values) - 1)].astype(bool)
+
+    if len(keyTimes) == 1:
+        return np.repeat(values, len(times), axis=0)
+
+    start = np.clip(index, 0, len(keyTimes) - 2)
+    span = keyTimes[start + 1] - keyTimes[start]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        progress = np.where(span > 0, (times - keyTimes[start]) / span, 1.0)
+    progress = np.clip(progress, 0.0, 1.0)
+
+    eased = np.empty_like(progress)
+    segmentBlends = blends[start]
+    for blend in set(segmentBlends):
+        mask = segmentBlends == blend
+        eased[mask] = ease(blend, progress[mask])
+
+    first, second = values[start], values[start + 1]
+    if keys is not None:
+        eased = eased[:, np.newaxis]
+    return first + (second - first) * eased
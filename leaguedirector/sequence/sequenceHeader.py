@@ -1,9 +1,9 @@
 from PySide2.QtCore import Qt
-from PySide2.QtGui import QPen, QColor, QPixmap
+from PySide2.QtGui import QPen, QColor
 from PySide2.QtWidgets import QGraphicsRectItem, QGraphicsItem, QGraphicsSimpleTextItem, QApplication, \
     QGraphicsPixmapItem
 
-from leaguedirector.widgets import respath
+from leaguedirector.libs.glyphCache import GlyphCache
 
 
 class SequenceHeader(QGraphicsRectItem):
@@ -24,7 +24,7 @@ class SequenceHeader(QGraphicsRectItem):
         self.text = QGraphicsSimpleTextItem(self.label(), self)
         self.text.setBrush(QApplication.palette().brightText())
         self.text.setPos(145 - self.text.boundingRect().width() - 20, 4)
-        self.button = QGraphicsPixmapItem(QPixmap(respath('plus.png')), self)
+        self.button = QGraphicsPixmapItem(GlyphCache.get_instance().glyph('plus.png'), self)
         self.button.setPos(140, 4)
         self.button.setCursor(Qt.ArrowCursor)
         self.button.mousePressEvent = lambda event: self.callback(self.name)
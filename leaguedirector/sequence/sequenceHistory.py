@@ -0,0 +1,141 @@
+import json
+
+
+class SequenceHistory(object):
+    """
+    Undo stack of keyframe level changes to a sequence, holding at most
+    maxBytes of keyframe text.
+    """
+    maxBytes = 32 * 1024 * 1024
+
+    def __init__(self, maxBytes=None):
+        self.maxBytes = maxBytes or self.maxBytes
+        self.clear()
+
+    def __len__(self):
+        return len(self.steps)
+
+    def clear(self):
+        self.steps = []
+        self.index = 0
+        # Text of tracks without keyframe keys as last recorded, they are recorded whole
+        self.state = {}
+        self.stamps = {}
+        self.bytes = 0
+        self.started = False
+
+    @staticmethod
+    def encode(keyframes):
+        return json.dumps(keyframes, separators=(',', ':'), sort_keys=True)
+
+    @staticmethod
+    def decode(text):
+        return None if text is None else json.loads(text)
+
+    @staticmethod
+    def size(step):
+        return sum(len(text) for texts in step.values() for text in texts if text is not None)
+
+    def used(self):
+        return self.bytes + sum(len(text) for text in self.state.values())
+
+    def changes(self, name, track):
+        """
+        Old and new text of the keyframes of a track that changed since the
+        last push, by key. None stands for a keyframe that doesn't exist.
+        """
+        if not hasattr(track, 'takeDirty'):
+            previous = self.state.get(name)
+            text = self.state[name] = self.encode(track.list())
+            return {} if previous == text else {None: (previous, text)}
+        dirty = track.takeDirty()
+        indexes = track.locateAll(list(dirty))
+        changed = {}
+        for key, old in dirty.items():
+            index = indexes[key]
+            texts = (
+                None if old is None else self.encode(old),
+                None if index is None else self.encode(track.dict(index)),
+            )
+            if texts[0] != texts[1]:
+                changed[key] = texts
+        return changed
+
+    def push(self, tracks):
+        """
+        Record what changed in tracks, a dict of track name to track, since
+        the last push and discard anything that could be redone. The first
+        push after clear only records where the history starts.
+        """
+        step = {}
+        replaced = False
+        for name, track in tracks.items():
+            stamp = self.stamps.get(name)
+            self.stamps[name] = (track, track.revision)
+            if stamp is not None and stamp[0] is track and stamp[1] == track.revision:
+                continue
+            if hasattr(track, 'takeDirty') and (stamp is None or stamp[0] is not track):
+                # The keyframes of a track swapped in behind the history's back are unknown
+                track.takeDirty()
+                self.state.pop(name, None)
+                replaced = replaced or stamp is not None
+                continue
+            step.update(((name, key), texts) for key, texts in self.changes(name, track).items())
+        if replaced:
+            del self.steps[:]
+            self.index = 0
+            self.bytes = 0
+        if not self.started:
+            self.started = True
+            return
+        if not step:
+            # Nothing changed, keep whatever can still be redone
+            return
+        for discarded in self.steps[self.index:]:
+            self.bytes -= self.size(discarded)
+        del self.steps[self.index:]
+        self.steps.append(step)
+        self.bytes += self.size(step)
+        self.index = len(self.steps)
+        while self.used() > self.maxBytes and len(self.steps) > 1:
+            self.bytes -= self.size(self.steps.pop(0))
+            self.index -= 1
+
+    def move(self, index):
+        """
+        Step to another point in the history and return what has to change
+        to get there, as a dict of track name to a dict of key to the old and
+        new keyframes. Empty if there is nothing to move to.
+        """
+        index = max(min(index, len(self.steps)), 0)
+        if index < self.index:
+            steps, side = reversed(self.steps[index:self.index]), 0
+        else:
+            steps, side = self.steps[self.index:index], 1
+        current = {}
+        target = {}
+        for step in steps:
+            for slot, texts in step.items():
+                # The first step walked holds what is there now, the last where it ends up
+                current.setdefault(slot, texts[1 - side])
+                target[slot] = texts[side]
+        self.index = index
+        changes = {}
+        for (name, key), text in target.items():
+            previous = current[(name, key)]
+            if previous != text:
+                changes.setdefault(name, {})[key] = (self.decode(previous), self.decode(text))
+        return changes
+
+    def sync(self, tracks):
+        """
+        Take the tracks as they are after applying changes from move, so they
+        aren't recorded again by the next push.
+        """
+        for name, track in tracks.items():
+            if hasattr(track, 'takeDirty'):
+                track.takeDirty()
+                self.state.pop(name, None)
+            else:
+                self.state[name] = self.encode(track.list())
+            self.stamps[name] = (track, track.revision)
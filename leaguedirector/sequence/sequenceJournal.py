@@ -0,0 +1,141 @@
+import os
+import json
+import hashlib
+import logging
+
+from leaguedirector.libs.fileWriter import FileWriter
+
+
+class SequenceJournal(object):
+    """
+    Append only log of keyframe edits kept next to a sequence file, replayed
+    over the snapshot whose digest is on its first line.
+    """
+    maxEntries = 1000
+
+    def __init__(self):
+        self.path = None
+        self.snapshot = None
+        self.entries = 0
+        # Whether the journal on disk has a header for the current snapshot
+        self.started = False
+        self.transaction = 0
+        self.pending = {}
+
+    @staticmethod
+    def pathFor(sequencePath):
+        return os.path.splitext(sequencePath)[0] + '.jsonl'
+
+    @staticmethod
+    def digest(text):
+        return hashlib.sha1(text.encode('utf8')).hexdigest()
+
+    def header(self):
+        return json.dumps({'snapshot': self.snapshot}) + '\n'
+
+    def record(self, entry):
+        if self.path is not None:
+            writer = FileWriter.get_instance()
+            if not self.started:
+                # Runs after any queued compaction has set the snapshot
+                path = self.path
+                writer.call(path, lambda: writer.replace(path, self.header()))
+                self.started = True
+            writer.append(self.path, json.dumps(entry, separators=(',', ':')) + '\n')
+            self.entries += 1
+
+    def add(self, track, keyframe):
+        self.record({'op': 'add', 'track': track, 'keyframe': dict(keyframe)})
+
+    def remove(self, track, keyframe):
+        self.commitKeyframe(keyframe)
+        self.record({'op': 'remove', 'track': track, 'keyframe': dict(keyframe)})
+
+    def modify(self, track, old, keyframe):
+        if not self.transaction:
+            self.record({'op': 'modify', 'track': track, 'old': old, 'new': dict(keyframe)})
+        elif id(keyframe) not in self.pending:
+            self.pending[id(keyframe)] = [track, old, keyframe]
+
+    def begin(self):
+        self.transaction += 1
+
+    def commit(self):
+        self.transaction = max(self.transaction - 1, 0)
+        if not self.transaction:
+            for track, old, keyframe in self.pending.values():
+                if old != dict(keyframe):
+                    self.record({'op': 'modify', 'track': track, 'old': old, 'new': dict(keyframe)})
+            self.pending = {}
+
+    def commitKeyframe(self, keyframe):
+        entry = self.pending.pop(id(keyframe), None)
+        if entry is not None and entry[1] != dict(keyframe):
+            self.record({'op': 'modify', 'track': entry[0], 'old': entry[1], 'new': dict(keyframe)})
+
+    def compact(self, path, data):
+        """
+        Queue a full write of the sequence to path and remove its journal.
+        """
+        self.path = self.pathFor(path)
+        self.entries = 0
+        self.started = False
+        for entry in self.pending.values():
+            # The snapshot already holds the edits made so far in the transaction
+            entry[1] = dict(entry[2])
+        writer = FileWriter.get_instance()
+        journal = self.path
+
+        def store(path, text):
+            writer.replace(path, text)
+            if os.path.exists(journal):
+                os.remove(journal)
+            self.snapshot = self.digest(text)
+
+        writer.write(path, lambda: json.dumps(data, sort_keys=True, indent=4), store)
+
+    def load(self, path, text):
+        """
+        Decode a sequence file and apply the journal recorded against it.
+        Returns the data and how many journal entries were replayed.
+        """
+        self.path = self.pathFor(path)
+        self.snapshot = self.digest(text)
+        self.entries = 0
+        self.started = False
+        self.pending = {}
+        data = json.loads(text)
+        lines = []
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf8') as f:
+                lines = f.read().splitlines()
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        if header.get('snapshot') != self.snapshot:
+            # Missing or left over from an older snapshot, replaced by the first entry
+            return data, 0
+        self.started = True
+        replayed = 0
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A crash can leave the last line half written
+                logging.warning('Ignoring damaged journal entry in %s', self.path)
+                break
+            self.apply(data, entry)
+            replayed += 1
+        return data, replayed
+
+    def apply(self, data, entry):
+        keyframes = data.setdefault(entry['track'], [])
+        if entry['op'] == 'add':
+            keyframes.append(entry['keyframe'])
+        elif entry['op'] == 'remove':
+            if entry['keyframe'] in keyframes:
+                keyframes.remove(entry['keyframe'])
+        elif entry['op'] == 'modify':
+            if entry['old'] in keyframes:
+                keyframes[keyframes.index(entry['old'])] = entry['new']
@@ -1,22 +1,43 @@
+import re
+
 from PySide2.QtCore import Qt
-from PySide2.QtGui import QPixmap
+from PySide2.QtGui import QColor
 from PySide2.QtWidgets import QGraphicsPixmapItem, QGraphicsItem, QApplication
 
+from leaguedirector.libs.glyphCache import GlyphCache
 from leaguedirector.sequence.sequenceTime import SequenceTime
 from leaguedirector.sequence.constant import PRECISION, SNAPPING
-from leaguedirector.widgets import respath
 
 
 class SequenceKeyframe(QGraphicsPixmapItem):
+    glyphNormal = 'kfnormal.png'
+    glyphOverlap = 'kfoverlap.png'
+    # Blend families, the leading lowercase part of a blend name, mapped to
+    # the color that tints their glyph. Linear keyframes keep the plain glyph.
+    blendTints = {
+        'snap': QColor(255, 110, 110),
+        'smooth': QColor(140, 230, 140),
+        'smoother': QColor(100, 200, 120),
+        'quadratic': QColor(255, 225, 120),
+        'cubic': QColor(255, 190, 100),
+        'quartic': QColor(255, 160, 90),
+        'quintic': QColor(240, 130, 80),
+        'sine': QColor(130, 220, 255),
+        'circular': QColor(120, 170, 255),
+        'exponential': QColor(190, 140, 255),
+        'elastic': QColor(240, 130, 240),
+        'back': QColor(255, 150, 200),
+        'bounce': QColor(200, 255, 150),
+    }
 
     def __init__(self, api, item, track):
-        self.pixmapNormal = QPixmap(respath('kfnormal.png'))
-        self.pixmapOverlap = QPixmap(respath('kfoverlap.png'))
-        QGraphicsPixmapItem.__init__(self, self.pixmapNormal, track)
+        QGraphicsPixmapItem.__init__(self, GlyphCache.get_instance().glyph(self.glyphNormal), track)
         self.api = api
         self.track = track
         self.item = item
         self.duplicate = None
+        self.overlapping = False
+        track.keyframes[track.keyOf(item)] = self
         self.setCursor(Qt.ArrowCursor)
         self.setShapeMode(QGraphicsPixmapItem.BoundingRectShape)
         flags = QGraphicsItem.ItemIgnoresTransformations
@@ -26,6 +47,7 @@ class SequenceKeyframe(QGraphicsPixmapItem):
         self.setFlags(flags)
         self.setOffset(-10, 3)
         self.update()
+        track.updateOverlap()
 
     def viewport(self):
         return self.scene().views()[0]
@@ -37,9 +59,8 @@ class SequenceKeyframe(QGraphicsPixmapItem):
     @time.setter
     def time(self, value):
         if self.item['time'] != value:
-            self.item['time'] = value
-            self.api.sequence.update()
-            self.track.updateOverlap()
+            self.api.sequence.retimeKeyframe(self.track.name, self.item, value)
+            self.track.keyframeMoved()
             self.update()
 
     @property
@@ -63,8 +84,7 @@ class SequenceKeyframe(QGraphicsPixmapItem):
     @value.setter
     def value(self, value):
         if self.item['value'] != value:
-            self.item['value'] = value
-            self.api.sequence.update()
+            self.api.sequence.modifyKeyframe(self.track.name, self.item, 'value', value)
             self.update()
 
     @property
@@ -74,13 +94,19 @@ class SequenceKeyframe(QGraphicsPixmapItem):
     @blend.setter
     def blend(self, value):
         if self.item.get('blend') != value:
-            self.item['blend'] = value
-            self.api.sequence.update()
+            self.api.sequence.modifyKeyframe(self.track.name, self.item, 'blend', value)
             self.update()
 
     def update(self):
         self.setPos(int(self.time * PRECISION), 0)
         self.setToolTip(self.tooltip())
+        self.updateGlyph()
+
+    def updateGlyph(self):
+        name = self.glyphOverlap if self.overlapping else self.glyphNormal
+        pixmap = GlyphCache.get_instance().glyph(name, self.blendTint())
+        if pixmap.cacheKey() != self.pixmap().cacheKey():
+            self.setPixmap(pixmap)
 
     def tooltip(self):
         value = self.value
@@ -90,10 +116,18 @@ class SequenceKeyframe(QGraphicsPixmapItem):
 
     def delete(self):
         self.api.sequence.removeKeyframe(self.track.name, self.item)
+        self.track.keyframes.pop(self.track.keyOf(self.item), None)
+        self.track.updateOverlap()
         self.scene().removeItem(self)
 
+    def blendTint(self):
+        family = re.match('[a-z]*', self.blend or '').group()
+        return self.blendTints.get(family)
+
     def setOverlapping(self, overlapping):
-        self.setPixmap(self.pixmapOverlap if overlapping else self.pixmapNormal)
+        if overlapping != self.overlapping:
+            self.overlapping = overlapping
+            self.updateGlyph()
 
     def mouseDoubleClickEvent(self, event):
         if event.button() == Qt.LeftButton and event.modifiers() == Qt.NoModifier:
@@ -107,9 +141,17 @@ class SequenceKeyframe(QGraphicsPixmapItem):
             if isinstance(key, SequenceKeyframe):
                 key.duplicate = None
         QGraphicsPixmapItem.mouseReleaseEvent(self, event)
+        self.viewport().endDrag()
+
+    def ungrabMouseEvent(self, event):
+        self.viewport().endDrag()
+        QGraphicsPixmapItem.ungrabMouseEvent(self, event)
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemPositionChange:
+            if self.scene() is not None and isinstance(self.scene().mouseGrabberItem(), SequenceKeyframe):
+                # Only moves dragged by the mouse open an edit, it ends when the grab does
+                self.viewport().beginDrag()
             value.setX(self.performSnapping(value.x()))
             value.setX(max(0, value.x()))
             value.setY(0)
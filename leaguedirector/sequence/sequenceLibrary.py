@@ -0,0 +1,99 @@
+import os
+import sqlite3
+import logging
+
+from PySide2.QtCore import QObject, Signal, QTimer, QThreadPool, QFileSystemWatcher
+
+from leaguedirector.sequence.sequenceLibraryScan import SequenceLibraryScan
+from leaguedirector.widgets import userpath
+
+
+class SequenceLibrary(QObject):
+    """
+    Names and metadata of the sequences in a directory, cached in SQLite and
+    rescanned in the background when the folder changes.
+    """
+    changed = Signal()
+    entriesChanged = Signal(list)
+    refreshDelay = 250
+    sortKeys = {
+        'name': (lambda entry: entry['name'].lower(), False),
+        'mtime': (lambda entry: entry.get('mtime') or 0, True),
+        'duration': (lambda entry: entry.get('duration') or 0, True),
+        'keyframes': (lambda entry: entry.get('keyframes') or 0, True),
+    }
+
+    def __init__(self, databasePath=None):
+        QObject.__init__(self)
+        self.databasePath = databasePath or userpath('cache', 'sequences.sqlite')
+        self.directory = None
+        self.entries = {}
+        self.scan = None
+        self.stale = False
+        self.watcher = QFileSystemWatcher()
+        self.watcher.directoryChanged.connect(self.refreshLater)
+        self.refreshTimer = QTimer()
+        self.refreshTimer.timeout.connect(self.refresh)
+        self.refreshTimer.setSingleShot(True)
+
+    def setDirectory(self, directory):
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self.directory = directory
+        self.watcher.addPath(directory)
+        self.entries = self.load()
+        self.changed.emit()
+        self.refresh()
+
+    def load(self):
+        try:
+            connection = SequenceLibraryScan.openDatabase(self.databasePath)
+            try:
+                return SequenceLibraryScan.entries(connection, self.directory)
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            logging.exception('Failed to read the sequence index')
+            return {}
+
+    def names(self):
+        return list(self.entries)
+
+    def entry(self, name):
+        return self.entries.get(name, {'name': name})
+
+    def sorted(self, names, key='name'):
+        """
+        Sort names by one of the keys in sortKeys using the indexed metadata.
+        """
+        function, reverse = self.sortKeys.get(key, self.sortKeys['name'])
+        return [entry['name'] for entry in sorted((self.entry(name) for name in names), key=function, reverse=reverse)]
+
+    def refreshLater(self, *args):
+        self.refreshTimer.start(self.refreshDelay)
+
+    def refresh(self):
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        if self.scan is not None:
+            # Scan again once the running one is done
+            self.stale = True
+            return
+        self.scan = SequenceLibraryScan(self.databasePath, self.directory)
+        self.scan.finished.connect(self.scanned)
+        QThreadPool.globalInstance().start(self.scan)
+
+    def scanned(self, result):
+        directory, entries = result
+        self.scan = None
+        if entries is not None and directory == self.directory:
+            previous = self.entries
+            self.entries = entries
+            if set(entries) != set(previous):
+                self.changed.emit()
+            updated = [name for name, entry in entries.items() if name in previous and previous[name] != entry]
+            if updated:
+                self.entriesChanged.emit(updated)
+        if self.stale:
+            self.stale = False
+            self.refresh()
@@ -0,0 +1,115 @@
+import os
+import json
+import logging
+import sqlite3
+
+from PySide2.QtCore import Signal
+
+from leaguedirector.libs.runnableWithSignals import RunnableWithSignals
+from leaguedirector.sequence.constant import TIMING_TRACKS
+
+
+class SequenceLibraryScan(RunnableWithSignals):
+    """
+    Brings the library index of one directory up to date, only parsing files
+    whose modification time or size changed.
+    """
+    finished = Signal(object)
+    # Bump when what is stored per sequence changes so old rows are rebuilt
+    schemaVersion = 2
+
+    def __init__(self, databasePath, directory, parent=None):
+        self.databasePath = databasePath
+        self.directory = directory
+        RunnableWithSignals.__init__(self, parent)
+
+    @classmethod
+    def openDatabase(cls, databasePath):
+        connection = sqlite3.connect(databasePath)
+        connection.row_factory = sqlite3.Row
+        with connection:
+            if connection.execute('PRAGMA user_version').fetchone()[0] != cls.schemaVersion:
+                connection.execute('DROP TABLE IF EXISTS sequences')
+                connection.execute('PRAGMA user_version = {:d}'.format(cls.schemaVersion))
+            connection.execute('''
+                CREATE TABLE IF NOT EXISTS sequences (
+                    directory TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    startTime REAL,
+                    endTime REAL,
+                    duration REAL,
+                    keyframes INTEGER NOT NULL,
+                    tracks TEXT NOT NULL,
+                    PRIMARY KEY (directory, name)
+                )
+            ''')
+        return connection
+
+    @classmethod
+    def entries(cls, connection, directory):
+        rows = connection.execute('SELECT * FROM sequences WHERE directory = ?', (directory,))
+        entries = {}
+        for row in rows:
+            entry = dict(row)
+            entry['tracks'] = json.loads(entry['tracks'])
+            entries[entry['name']] = entry
+        return entries
+
+    def run(self):
+        try:
+            entries = self.scan()
+        except Exception:
+            logging.exception('Failed to index sequences in %s', self.directory)
+            entries = None
+        self.finished.emit((self.directory, entries))
+
+    def scan(self):
+        connection = self.openDatabase(self.databasePath)
+        try:
+            known = {
+                row['name']: (row['mtime'], row['size'])
+                for row in connection.execute('SELECT name, mtime, size FROM sequences WHERE directory = ?',
+                                              (self.directory,))
+            }
+            found = set()
+            changed = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.json') and entry.is_file():
+                    name = entry.name[:-len('.json')]
+                    stat = entry.stat()
+                    found.add(name)
+                    if known.get(name) != (stat.st_mtime, stat.st_size):
+                        changed.append(self.describe(entry.path, name, stat))
+            removed = [(self.directory, name) for name in set(known) - found]
+            with connection:
+                connection.executemany('''
+                    INSERT OR REPLACE INTO sequences
+                    (directory, name, mtime, size, startTime, endTime, duration, keyframes, tracks)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', changed)
+                connection.executemany('DELETE FROM sequences WHERE directory = ? AND name = ?', removed)
+            return self.entries(connection, self.directory)
+        finally:
+            connection.close()
+
+    def describe(self, path, name, stat):
+        tracks = {}
+        times = []
+        try:
+            with open(path, 'r', encoding='utf8') as f:
+                data = json.load(f)
+            for track, keyframes in data.items():
+                if isinstance(keyframes, list):
+                    tracks[track] = len(keyframes)
+                if isinstance(keyframes, list) and track in TIMING_TRACKS:
+                    times.extend(keyframe['time'] for keyframe in keyframes
+                                 if isinstance(keyframe, dict) and 'time' in keyframe)
+        except (OSError, ValueError, AttributeError):
+            logging.warning('Could not read sequence %s', path)
+        startTime = min(times) if times else None
+        endTime = max(times) if times else None
+        duration = endTime - startTime if times else None
+        return (self.directory, name, stat.st_mtime, stat.st_size, startTime, endTime, duration,
+                sum(tracks.values()), json.dumps(tracks))
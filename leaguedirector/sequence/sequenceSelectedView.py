@@ -117,25 +117,30 @@ class SequenceSelectedView(QWidget):
             self.valueColor.setVisible(False)
 
     def updateTime(self):
-        for item in self.tracks.selectedKeyframes():
-            item.time = self.time.value()
+        with self.api.sequence.edit():
+            for item in self.tracks.selectedKeyframes():
+                item.time = self.time.value()
 
     def updateValue(self, value):
-        for item in self.tracks.selectedKeyframes():
-            item.value = value
+        with self.api.sequence.edit():
+            for item in self.tracks.selectedKeyframes():
+                item.value = value
 
     def addValueVector(self, value):
-        for item in self.tracks.selectedKeyframes():
-            item.value = {
-                'x': item.value['x'] + value['x'],
-                'y': item.value['y'] + value['y'],
-                'z': item.value['z'] + value['z'],
-            }
+        with self.api.sequence.edit():
+            for item in self.tracks.selectedKeyframes():
+                item.value = {
+                    'x': item.value['x'] + value['x'],
+                    'y': item.value['y'] + value['y'],
+                    'z': item.value['z'] + value['z'],
+                }
 
     def addValueFloat(self, value):
-        for item in self.tracks.selectedKeyframes():
-            item.value += value
+        with self.api.sequence.edit():
+            for item in self.tracks.selectedKeyframes():
+                item.value += value
 
     def updateBlend(self, index):
-        for item in self.tracks.selectedKeyframes():
-            item.blend = self.blend.itemText(index)
+        with self.api.sequence.edit():
+            for item in self.tracks.selectedKeyframes():
+                item.blend = self.blend.itemText(index)
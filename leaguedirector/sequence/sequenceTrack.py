@@ -1,5 +1,4 @@
 import copy
-from operator import methodcaller
 
 from PySide2.QtCore import QTimer, QPointF
 from PySide2.QtGui import QPen, QColor, QLinearGradient, QGradient, QBrush
@@ -17,6 +16,9 @@ class SequenceTrack(QGraphicsRectItem):
         self.api = api
         self.name = name
         self.index = index
+        self.keyframes = {}
+        self.synced = None
+        self.overlapStale = False
         self.setPos(0, self.height * self.index)
         self.setToolTip(self.api.sequence.getLabel(self.name))
         self.setPen(QPen(QColor(70, 70, 70, 255)))
@@ -30,30 +32,69 @@ class SequenceTrack(QGraphicsRectItem):
         self.gradient.setColorAt(1, QColor(40, 40, 40, 255))
         self.gradient.setSpread(QGradient.RepeatSpread)
         self.setBrush(QBrush(self.gradient))
+        self.api.sequence.editFinished.connect(self.finishEdit)
         self.reload()
         self.update()
 
     def viewport(self):
         return self.scene().views()[0]
 
-    def paint(self, *args):
+    @staticmethod
+    def keyOf(item):
+        """
+        Stable key of a keyframe view, the identity of a raw keyframe dict.
+        """
+        return getattr(item, 'key', None) or id(item)
+
+    def reload(self, keys=None):
+        """
+        Add, remove and move keyframe items to match the track. Items of
+        keyframes that are still there are kept, along with their selection.
+        When keys is given only the items of those keyframes are touched.
+        """
+        keyframes = self.api.sequence.getKeyframes(self.name)
+        if self.synced is not None and self.synced[0] is keyframes and self.synced[1] == keyframes.revision:
+            return
+        if keys is not None and self.synced is not None and self.synced[0] is keyframes:
+            self.reloadKeys(keyframes, keys)
+        else:
+            self.reloadAll(keyframes)
+        self.synced = (keyframes, keyframes.revision)
         self.updateOverlap()
-        return QGraphicsRectItem.paint(self, *args)
 
-    def reload(self):
-        for item in self.childItems():
-            if isinstance(item, SequenceKeyframe):
-                self.scene().removeItem(item)
-        for item in self.api.sequence.getKeyframes(self.name):
-            SequenceKeyframe(self.api, item, self)
+    def reloadAll(self, keyframes):
+        items = {self.keyOf(item): item for item in keyframes}
+        for key, keyframe in list(self.keyframes.items()):
+            if items.get(key) is not keyframe.item:
+                del self.keyframes[key]
+                self.scene().removeItem(keyframe)
+        for key, item in items.items():
+            keyframe = self.keyframes.get(key)
+            if keyframe is None:
+                SequenceKeyframe(self.api, item, self)
+            else:
+                keyframe.update()
+
+    def reloadKeys(self, keyframes, keys):
+        for key in keys:
+            index = keyframes.locate(key)
+            item = None if index is None else keyframes[index]
+            keyframe = self.keyframes.get(key)
+            if keyframe is not None and keyframe.item is not item:
+                del self.keyframes[key]
+                self.scene().removeItem(keyframe)
+                keyframe = None
+            if keyframe is not None:
+                keyframe.update()
+            elif item is not None:
+                SequenceKeyframe(self.api, item, self)
 
     def addKeyframe(self):
         item = self.api.sequence.createKeyframe(self.name)
         return SequenceKeyframe(self.api, item, self)
 
     def duplicateKeyframe(self, keyframe):
-        item = copy.deepcopy(keyframe.item)
-        self.api.sequence.appendKeyframe(self.name, item)
+        item = self.api.sequence.appendKeyframe(self.name, copy.deepcopy(keyframe.item))
         return SequenceKeyframe(self.api, item, self)
 
     def clearKeyframes(self):
@@ -62,20 +103,42 @@ class SequenceTrack(QGraphicsRectItem):
                 item.delete()
 
     def updateOverlapNow(self):
+        """
+        Flag keyframes closer than OVERLAP pixels to a neighbour in one sweep
+        over the track, which is already sorted by time.
+        """
+        if self.scene() is None:
+            return
         viewport = self.viewport()
         distance = viewport.mapToScene(OVERLAP, 0).x() - viewport.mapToScene(0, 0).x()
-        previous = None
-        for child in sorted(self.childItems(), key=methodcaller('x')):
-            if isinstance(child, SequenceKeyframe):
-                if previous and abs(child.x() - previous.x()) < distance:
-                    child.setOverlapping(True)
-                    previous.setOverlapping(True)
-                else:
-                    child.setOverlapping(False)
-                previous = child
+        children = [self.keyframes.get(self.keyOf(item)) for item in self.api.sequence.getKeyframes(self.name)]
+        children = [child for child in children if child is not None]
+        overlapping = [False] * len(children)
+        for index in range(1, len(children)):
+            if abs(children[index].x() - children[index - 1].x()) < distance:
+                overlapping[index - 1] = overlapping[index] = True
+        for child, value in zip(children, overlapping):
+            # Only keyframes whose flag flipped change their pixmap
+            child.setOverlapping(value)
+
+    def keyframeMoved(self):
+        if self.api.sequence.editing:
+            # Dragging moves keyframes on every mouse move, check once the edit ends
+            self.overlapStale = True
+        else:
+            self.updateOverlap()
+
+    def finishEdit(self):
+        if self.overlapStale:
+            self.overlapStale = False
+            self.updateOverlap()
 
     def updateOverlap(self):
-        self.updateOverlapTimer.start(100)
+        """
+        Recompute overlaps shortly after keyframe times or the zoom change.
+        """
+        if not self.updateOverlapTimer.isActive():
+            self.updateOverlapTimer.start(100)
 
     def update(self):
         self.setRect(0, 0, int(self.api.playback.length * PRECISION), self.height)
\ No newline at end of file
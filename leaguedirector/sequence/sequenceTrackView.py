@@ -6,12 +6,12 @@ from PySide2.QtCore import Signal, Qt, QEvent
 from PySide2.QtGui import QPen, QMouseEvent
 from PySide2.QtWidgets import QGraphicsView, QGraphicsScene, QAbstractScrollArea, QApplication, QGraphicsItem
 
+from leaguedirector.libs.animationDriver import AnimationDriver
 from leaguedirector.libs.memoryCache import MemoryCache
 from leaguedirector.sequence.constant import PRECISION, ADJACENT
 from leaguedirector.sequence.sequenceKeyframe import SequenceKeyframe
 from leaguedirector.sequence.sequenceTime import SequenceTime
 from leaguedirector.sequence.sequenceTrack import SequenceTrack
-from leaguedirector.widgets import schedule
 
 
 class SequenceTrackView(QGraphicsView):
@@ -22,7 +22,7 @@ class SequenceTrackView(QGraphicsView):
         self.scene = QGraphicsScene()
         QGraphicsView.__init__(self, self.scene)
         self.tracks = {}
-        self.timer = schedule(10, self.animate)
+        self.dragging = False
         self.scale(1.0 / PRECISION, 1.0)
         self.setDragMode(QGraphicsView.NoDrag)
         self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
@@ -39,10 +39,12 @@ class SequenceTrackView(QGraphicsView):
         self.api.playback.updated.connect(self.update)
         self.api.sequence.updated.connect(self.update)
         self.api.sequence.dataLoaded.connect(self.reload)
+        self.api.sequence.keyframesChanged.connect(self.reloadKeyframes)
         headers.addKeyframe.connect(self.addKeyframe)
         headers.verticalScrollBar().valueChanged.connect(lambda value: self.verticalScrollBar().setValue(value))
         self.verticalScrollBar().valueChanged.connect(lambda value: headers.verticalScrollBar().setValue(value))
         self.scene.selectionChanged.connect(self.selectionChanged.emit)
+        AnimationDriver.get_instance().tick.connect(self.animate)
 
         self.clipboard = MemoryCache()
         self.clipboard.set('copied_key_frames', [])
@@ -57,14 +59,17 @@ class SequenceTrackView(QGraphicsView):
         keyframes = self.clipboard.get('copied_key_frames')
         for keyframe in keyframes:
             [name, item] = keyframe
-            item = copy.deepcopy(item)
-            self.api.sequence.appendKeyframe(name, item)
+            item = self.api.sequence.appendKeyframe(name, copy.deepcopy(item))
             SequenceKeyframe(self.api, item, self.tracks[name])
 
     def reload(self):
         for track in self.tracks.values():
             track.reload()
 
+    def reloadKeyframes(self, changes):
+        for name, keys in changes.items():
+            self.tracks[name].reload(keys)
+
     def selectedKeyframes(self):
         return [key for key in self.scene.selectedItems() if isinstance(key, SequenceKeyframe)]
 
@@ -96,10 +101,9 @@ class SequenceTrackView(QGraphicsView):
         selectionSorted = sorted(self.selectedKeyframes(), key=attrgetter('time'))
         trackSelection = {key.track: key for key in selectionSorted}
         for track, selected in trackSelection.items():
-            for child in sorted(track.childItems(), key=attrgetter('time')):
-                if child.time > selected.time:
-                    trackSelection[track] = child
-                    break
+            item = self.api.sequence.getKeyframes(track.name).next(selected.time)
+            if item is not None:
+                trackSelection[track] = track.keyframes.get(track.keyOf(item), selected)
         self.scene.clearSelection()
         for item in trackSelection.values():
             item.setSelected(True)
@@ -108,10 +112,9 @@ class SequenceTrackView(QGraphicsView):
         selectionSorted = sorted(self.selectedKeyframes(), key=attrgetter('time'), reverse=True)
         trackSelection = {key.track: key for key in selectionSorted}
         for track, selected in trackSelection.items():
-            for child in sorted(track.childItems(), key=attrgetter('time'), reverse=True):
-                if child.time < selected.time:
-                    trackSelection[track] = child
-                    break
+            item = self.api.sequence.getKeyframes(track.name).prev(selected.time)
+            if item is not None:
+                trackSelection[track] = track.keyframes.get(track.keyOf(item), selected)
         self.scene.clearSelection()
         for item in trackSelection.values():
             item.setSelected(True)
@@ -150,11 +153,29 @@ class SequenceTrackView(QGraphicsView):
         QGraphicsView.mouseReleaseEvent(self, event)
         self.setDragMode(QGraphicsView.NoDrag)
 
+    def focusOutEvent(self, event):
+        # The release may never arrive when a window takes over mid drag
+        self.endDrag()
+        QGraphicsView.focusOutEvent(self, event)
+
+    def beginDrag(self):
+        if not self.dragging:
+            # Keyframes moved by this drag are synced once it ends
+            self.dragging = True
+            self.api.sequence.beginEdit()
+
+    def endDrag(self):
+        if self.dragging:
+            self.dragging = False
+            self.api.sequence.endEdit()
+
     def wheelEvent(self, event):
         if event.angleDelta().y() > 0:
             self.scale(1.1, 1.0)
         else:
             self.scale(0.9, 1.0)
+        for track in self.tracks.values():
+            track.updateOverlap()
 
     def animate(self):
         self.time.setPos(self.api.playback.currentTime * PRECISION, 0)
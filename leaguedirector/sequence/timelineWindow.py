@@ -3,11 +3,12 @@ import functools
 from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QWidget, QVBoxLayout, QFileDialog, QPushButton, QStyle, QLabel, QSlider, QInputDialog
 
+from leaguedirector.libs.animationDriver import AnimationDriver
 from leaguedirector.sequence.sequenceSelectedView import SequenceSelectedView
 from leaguedirector.sequence.sequenceCombo import SequenceCombo
 from leaguedirector.sequence.sequenceTrackView import SequenceTrackView
 from leaguedirector.sequence.sequenceHeaderView import SequenceHeaderView
-from leaguedirector.widgets import schedule, userpath, HBoxWidget, BooleanInput, FloatSlider, VBoxWidget
+from leaguedirector.widgets import userpath, HBoxWidget, BooleanInput, FloatSlider, VBoxWidget
 
 
 class TimelineWindow(QWidget):
@@ -16,7 +17,6 @@ class TimelineWindow(QWidget):
         self.api = api
         self.api.playback.updated.connect(self.update)
         self.api.sequence.updated.connect(self.update)
-        self.timer = schedule(10, self.animate)
         self.sequenceHeaders = SequenceHeaderView(self.api)
         self.sequenceTracks = SequenceTrackView(self.api, self.sequenceHeaders)
         layout = QVBoxLayout()
@@ -26,6 +26,8 @@ class TimelineWindow(QWidget):
         self.layoutSequencer(layout)
         self.setWindowTitle('Timeline')
         self.setLayout(layout)
+        self.driver = AnimationDriver.get_instance()
+        self.driver.tick.connect(self.animate)
 
     def saveSettings(self):
         return {'directory': self.api.sequence.directory}
@@ -107,6 +109,7 @@ class TimelineWindow(QWidget):
         self.timeSlider.setTickInterval(60000)
         self.timeSlider.setTracking(False)
         self.timeSlider.sliderReleased.connect(self.onTimeline)
+        self.timeSlider.sliderMoved.connect(lambda position: self.animate())
         widget.addWidget(self.timeLabel)
         widget.addWidget(self.timeSlider)
         layout.addWidget(widget)
@@ -218,9 +221,31 @@ class TimelineWindow(QWidget):
         minutes, seconds = divmod(t, 60)
         return '{0:02}:{1:05.2f}'.format(int(minutes), seconds)
 
+    def showEvent(self, event):
+        QWidget.showEvent(self, event)
+        self.updateAnimation()
+
+    def hideEvent(self, event):
+        QWidget.hideEvent(self, event)
+        self.updateAnimation()
+
+    def updateAnimation(self):
+        """
+        Animate the playhead only while playback runs and the timeline can be
+        seen, otherwise draw it once where playback is now.
+        """
+        playing = not self.api.playback.paused and not self.api.playback.seeking
+        visible = self.isVisible() and not self.window().isMinimized()
+        self.driver.setActive(self, playing and visible)
+        if visible and not playing:
+            self.animate()
+            self.sequenceTracks.animate()
+
     def animate(self):
-        self.speed.update(self.api.playback.speed)
-        self.timeSlider.setRange(0, self.api.playback.length * 1000)
+        if self.window().isMinimized():
+            # Nothing to draw until playback updates again after a restore
+            self.driver.setActive(self, False)
+            return
         if self.timeSlider.isSliderDown():
             self.timeLabel.setText(self.formatTime(self.timeSlider.sliderPosition() / 1000))
         else:
@@ -228,6 +253,8 @@ class TimelineWindow(QWidget):
             self.timeSlider.setValue(self.api.playback.currentTime * 1000)
 
     def update(self):
+        self.speed.update(self.api.playback.speed)
+        self.timeSlider.setRange(0, self.api.playback.length * 1000)
         self.applySequence.update(self.api.sequence.sequencing)
         if self.api.playback.seeking:
             self.play.setDisabled(True)
@@ -237,4 +264,5 @@ class TimelineWindow(QWidget):
             self.play.setText('Play')
         else:
             self.play.setDisabled(False)
-            self.play.setText('Pause')
\ No newline at end of file
+            self.play.setText('Pause')
+        self.updateAnimation()
\ No newline at end of file
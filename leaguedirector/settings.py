@@ -1,5 +1,7 @@
 import os
 import json
+from contextlib import contextmanager
+from leaguedirector.libs.fileWriter import FileWriter
 from leaguedirector.widgets import userpath
 
 class Settings(object):
@@ -7,20 +9,44 @@ class Settings(object):
     def __init__(self):
         self.data = {}
         self.path = userpath('config.json')
+        self.batching = 0
+        self.dirty = False
         self.loadFile()
 
     def value(self, key, default=None):
         return self.data.get(key, default)
 
     def setValue(self, key, value):
-        self.data[key] = value
-        self.saveFile()
+        # Compare in the form the value is stored on disk, tuples come back as lists
+        value = json.loads(json.dumps(value))
+        if key not in self.data or self.data[key] != value:
+            self.data[key] = value
+            self.dirty = True
+        if not self.batching:
+            self.saveFile()
+
+    @contextmanager
+    def batch(self):
+        """
+        Write the file once after a group of setValue calls, if any of them changed it.
+        """
+        self.batching += 1
+        try:
+            yield self
+        finally:
+            self.batching -= 1
+            if not self.batching:
+                self.saveFile()
 
     def saveFile(self):
-        with open(self.path, 'w') as f:
-            json.dump(self.data, f, sort_keys=True, indent=4)
+        if not self.dirty:
+            return
+        self.dirty = False
+        data = dict(self.data)
+        FileWriter.get_instance().write(self.path, lambda: json.dumps(data, sort_keys=True, indent=4))
 
     def loadFile(self):
+        FileWriter.get_instance().flush(self.path)
         if os.path.isfile(self.path):
             with open(self.path, 'r') as f:
                 self.data = json.load(f)
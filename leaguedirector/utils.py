@@ -39,7 +39,9 @@ def getFilePaths(dirPath: str) -> List[str]:
 
 
 def getFiles(dirPath: str) -> List[File]:
-    fileNames = sorted([fileName for fileName in os.listdir(dirPath)])
+    # Skip hidden files such as the temporary files a crash can leave behind mid write
+    fileNames = sorted([fileName for fileName in os.listdir(dirPath)
+                        if not fileName.startswith('.') and not fileName.endswith('.tmp')])
     return [File(os.path.join(dirPath, fileName)) for fileName in fileNames]
 
 
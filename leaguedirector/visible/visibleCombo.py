@@ -21,8 +21,9 @@ class VisibleCombo(QComboBox):
 
     def onActivated(self, index):
         visible = self.visibleDataContainer.getVisibleByName(self.itemText(index))
-        for attribute in getAttributes(Visible):
-            self.api.render.set(attribute, getattr(visible, attribute))
+        with self.api.render.batch():
+            for attribute in getAttributes(Visible):
+                self.api.render.set(attribute, getattr(visible, attribute))
 
     def updateUI(self, file: Optional[File]):
         if not file:
@@ -1,3 +1,4 @@
+from operator import attrgetter
 from typing import List, Optional
 import json
 
@@ -5,6 +6,7 @@ from PySide2 import QtCore
 from PySide2.QtCore import Signal
 
 from leaguedirector.libs.file import File
+from leaguedirector.libs.fileWriter import FileWriter
 from leaguedirector.utils import getFilePaths, getFiles, getAttributes
 from leaguedirector.visible.visible import Visible
 from leaguedirector.visible.visibleScheme import VisibleScheme
@@ -42,7 +44,12 @@ class VisibleDataContainer(QtCore.QObject):
         return 0
 
     def loadFiles(self):
-        self.files =  getFiles(self.dirPath)
+        writer = FileWriter.get_instance()
+        files = getFiles(self.dirPath)
+        listed = {file.path for file in files}
+        # Files still queued for writing aren't on disk yet, keep listing them
+        queued = [file for file in self.files if file.path not in listed and writer.pending(file.path)]
+        self.files = sorted(files + queued, key=attrgetter('baseName'))
         return self.files
 
     def getVisibleByName(self, name: str) -> Visible:
@@ -66,7 +73,10 @@ class VisibleDataContainer(QtCore.QObject):
         if visible is None:
             visible = Visible()
         self._visibleScheme.saveToJson(filePath, visible)
-        self.loadFilesAndEmitChangedFiles(name)
+        if self.getFileByName(name) is None:
+            # The file is still queued for writing, list it without reading the directory
+            self.files = sorted(self.files + [File(filePath)], key=attrgetter('baseName'))
+        self.changedFiles.emit(self.getFileByName(name))
 
     def saveFileByNameFromApiVisible(self, name: str):
         visible = Visible()
@@ -76,6 +86,7 @@ class VisibleDataContainer(QtCore.QObject):
         self.saveFileByName(name, visible)
 
     def removeByName(self, name: str):
+        FileWriter.get_instance().flush(self.getFilePathByName(name))
         os.remove(self.getFilePathByName(name))
         self.loadFilesAndEmitChangedFiles(name)
 
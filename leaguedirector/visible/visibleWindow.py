@@ -94,18 +94,20 @@ class VisibleWindow(QScrollArea):
             self.visibleCombo.newVisible(name)
 
     def connect(self):
-        for name, field in self.inputs.items():
-            self.api.render.set(name, field.value())
+        with self.api.render.batch():
+            for name, field in self.inputs.items():
+                self.api.render.set(name, field.value())
 
     def update(self):
         for name, field in self.inputs.items():
             field.setValue(self.api.render.get(name))
 
     def restoreSettings(self, data):
-        for name, value in data.items():
-            if name in self.inputs:
-                self.inputs[name].update(value)
-                self.api.render.set(name, value)
+        with self.api.render.batch():
+            for name, value in data.items():
+                if name in self.inputs:
+                    self.inputs[name].update(value)
+                    self.api.render.set(name, value)
 
     def saveSettings(self):
         return {name: self.api.render.get(name) for name in self.inputs}